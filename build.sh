@@ -6,6 +6,8 @@ echo "->Install requirements"
 pip install -r requirements.txt
 echo "->Collect static files"
 python manage.py collectstatic --noinput
+echo "->Compile skills catalog"
+python manage.py compile_skills
 
 
 # If migrations fail Refresh the DBs .
@@ -16,6 +18,7 @@ PGPASSWORD=$DB_PASSWORD psql -h $DB_HOST -U $DB_USER -d $DB_NAME -c "DROP SCHEMA
 
 echo "->Make migrations"
 python manage.py migrate    
+python manage.py createcachetable
 
 # Custom set up
 python manage.py load_skills
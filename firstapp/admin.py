@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db import transaction
 from django.utils import timezone
 from .models import (
     AltUser, Profile, SkillGroup, SkillSubgroup, SkillName, Skill, 
@@ -21,12 +22,13 @@ class ProfileAdmin(admin.ModelAdmin):
 @admin.register(CourseEnrollmentRequest)
 class CourseEnrollmentRequestAdmin(admin.ModelAdmin):
     list_display = ['user', 'course_full_name', 'status', 'requested_at', 'reviewed_by']
-    list_filter = ['status', 'skill_group', 'requested_at', 'reviewed_at']
-    search_fields = ['user__username', 'skill_group', 'skill_subgroup', 'skill_name']
+    list_filter = ['status', 'course__subgroup__group', 'requested_at', 'reviewed_at']
+    search_fields = ['user__username', 'course__subgroup__group__name', 'course__subgroup__name', 'course__name']
     readonly_fields = ['requested_at', 'reviewed_at']
     
     actions = ['approve_requests', 'reject_requests']
     
+    @transaction.atomic
     def approve_requests(self, request, queryset):
         approved_count = 0
         for enrollment_request in queryset.filter(status='pending'):
@@ -38,9 +40,7 @@ class CourseEnrollmentRequestAdmin(admin.ModelAdmin):
             # Create approved enrollment
             ApprovedCourseEnrollment.objects.get_or_create(
                 user=enrollment_request.user,
-                skill_group=enrollment_request.skill_group,
-                skill_subgroup=enrollment_request.skill_subgroup,
-                skill_name=enrollment_request.skill_name,
+                course_id=enrollment_request.course_id,
                 defaults={'enrollment_request': enrollment_request}
             )
             approved_count += 1
@@ -60,26 +60,22 @@ class CourseEnrollmentRequestAdmin(admin.ModelAdmin):
 @admin.register(ApprovedCourseEnrollment)
 class ApprovedCourseEnrollmentAdmin(admin.ModelAdmin):
     list_display = ['user', 'skill_group', 'skill_subgroup', 'skill_name', 'enrolled_at']
-    list_filter = ['skill_group', 'enrolled_at']
-    search_fields = ['user__username', 'skill_group', 'skill_subgroup', 'skill_name']
+    list_filter = ['course__subgroup__group', 'enrolled_at']
+    search_fields = ['user__username', 'course__subgroup__group__name', 'course__subgroup__name', 'course__name']
     readonly_fields = ['enrolled_at']
 
 @admin.register(ScheduledCourse)
 class ScheduledCourseAdmin(admin.ModelAdmin):
     list_display = ['__str__', 'instructor', 'scheduled_date', 'scheduled_time', 'max_students', 'enrolled_count']
-    list_filter = ['skill_group', 'scheduled_date', 'instructor']
-    search_fields = ['skill_group', 'skill_subgroup', 'skill_name', 'instructor__username']
-    readonly_fields = ['created_at']
-    
-    def enrolled_count(self, obj):
-        return obj.courseattendance_set.count()
-    enrolled_count.short_description = 'Enrolled Students'
+    list_filter = ['is_private', 'course__subgroup__group', 'scheduled_date', 'instructor']
+    search_fields = ['course__subgroup__group__name', 'course__subgroup__name', 'course__name', 'private_label', 'instructor__username']
+    readonly_fields = ['created_at', 'enrolled_count']
 
 @admin.register(CourseAttendance)
 class CourseAttendanceAdmin(admin.ModelAdmin):
     list_display = ['student', 'scheduled_course', 'enrolled_at', 'attended']
     list_filter = ['attended', 'enrolled_at', 'scheduled_course__scheduled_date']
-    search_fields = ['student__username', 'scheduled_course__skill_group']
+    search_fields = ['student__username', 'scheduled_course__course__name']
     readonly_fields = ['enrolled_at']
 
 admin.site.register(SkillGroup)
@@ -0,0 +1,343 @@
+"""
+In-process skills catalog built from skills.yaml.
+
+The YAML file is parsed once per process into a read-only structure and is
+only reparsed when the file's mtime or size changes. Every caller (context
+processor, forms, views) shares the same parsed catalog.
+
+At build time ``manage.py compile_skills`` writes a JSON snapshot of the
+parsed YAML together with the SHA-256 of the source. When the snapshot
+matches the current skills.yaml it is loaded instead, so workers never
+need to import or run PyYAML.
+
+Once ``manage.py load_skills`` has synced the SkillGroup/SkillSubgroup/
+SkillName tables it bumps the CatalogVersion stamp, and from then on the
+tables are the runtime source of truth: ``get_catalog`` reads them in a
+few queries and keeps the result in memory until the stamp changes. Only
+rows load_skills flagged ``in_catalog`` are read, so skill names kept for
+old course records never show up. The file catalog remains the input for
+load_skills and the fallback for a database that has not been loaded yet.
+
+Workers hot-reload: each process re-checks the stamp at most once every
+``CATALOG_CHECK_INTERVAL`` seconds and swaps in the new catalog by
+replacing a single reference. CatalogMiddleware pins the catalog a
+request first sees, so a swap never changes it mid-request.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from contextvars import ContextVar
+from collections import namedtuple
+from types import MappingProxyType
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.urls import reverse
+from django.utils.functional import cached_property
+
+SKILLS_YAML_PATH = os.path.join(settings.BASE_DIR, 'firstapp', 'skills.yaml')
+SKILLS_SNAPSHOT_PATH = os.path.join(settings.BASE_DIR, 'firstapp', 'skills.compiled.json')
+
+_lock = threading.Lock()
+_file_catalog = None
+_db_catalog = None
+
+# Catalog served by get_catalog() and when its source was last checked
+_current_catalog = None
+_checked_at = 0.0
+
+# Per-request dict holding the pinned catalog, set by CatalogMiddleware
+_request_state = ContextVar('catalog_request_state', default=None)
+
+# Lookup result for a single (group, subgroup, skill) entry. ``position`` is
+# the (group, subgroup, skill) index triple of the entry inside the catalog.
+SkillEntry = namedtuple('SkillEntry', ['lessons', 'metadata', 'position'])
+
+
+def _freeze(value):
+    """Recursively turn parsed YAML into read-only mappings and tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _file_stamp(path):
+    """Return (mtime_ns, size) for the file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_source(path):
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def content_hash(raw):
+    """SHA-256 hex digest of the raw skills.yaml bytes"""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def parse_yaml(raw):
+    """Parse skills.yaml bytes, using the C loader when PyYAML has one"""
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(raw, Loader=loader) or []
+
+
+def _load_snapshot(path, digest):
+    """Return the snapshot's groups if it was compiled from ``digest``, else None"""
+    try:
+        with open(path, 'r') as file:
+            snapshot = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get('sha256') != digest:
+        return None
+    return snapshot.get('groups')
+
+
+def compile_snapshot(source_path=SKILLS_YAML_PATH, snapshot_path=SKILLS_SNAPSHOT_PATH):
+    """Compile skills.yaml into a JSON snapshot and return (digest, groups)"""
+    raw = _read_source(source_path)
+    digest = content_hash(raw)
+    groups = parse_yaml(raw)
+
+    tmp_path = f"{snapshot_path}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump({'sha256': digest, 'groups': groups}, file, separators=(',', ':'))
+    os.replace(tmp_path, snapshot_path)
+    return digest, groups
+
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def _tokenize(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """Token prefix index over the catalog's skills and lesson titles
+
+    Skill documents are matched by their group, subgroup and skill names;
+    lesson documents by the lesson title. Every query token is treated as
+    a prefix and all of them must match.
+    """
+
+    def __init__(self, catalog):
+        self.documents = []
+        prefixes = {}
+        for (group, subgroup, skill), entry in catalog.skills.items():
+            # Same double-encoding as the {% url 'lessons' ...|urlencode %} links in base.html
+            url = reverse('lessons', args=[quote(group), quote(subgroup), quote(skill)])
+            course = {'group': group, 'subgroup': subgroup, 'skill': skill, 'url': url}
+            self._add(prefixes, dict(course, type='skill', title=skill), f"{group} {subgroup} {skill}")
+            for lesson in entry.lessons:
+                self._add(prefixes, dict(course, type='lesson', title=lesson), lesson)
+        self.prefixes = {prefix: frozenset(ids) for prefix, ids in prefixes.items()}
+
+    def _add(self, prefixes, document, text):
+        doc_id = len(self.documents)
+        self.documents.append(document)
+        for token in set(_tokenize(text)):
+            for end in range(1, len(token) + 1):
+                prefixes.setdefault(token[:end], set()).add(doc_id)
+
+    def search(self, query, limit=20):
+        """Return matching documents, skills first, then in catalog order"""
+        matches = None
+        for token in _tokenize(query):
+            ids = self.prefixes.get(token, frozenset())
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+        if matches is None:
+            return []
+        ranked = sorted(matches, key=lambda doc_id: (self.documents[doc_id]['type'] != 'skill', doc_id))
+        return [self.documents[doc_id] for doc_id in ranked[:limit]]
+
+
+class Catalog:
+    """Immutable, parsed view of the skills catalog"""
+
+    def __init__(self, groups, stamp, version=None, skill_paths=None):
+        self.groups = groups
+        self.stamp = stamp
+        self.version = version
+        self.skills = self._build_index(groups)
+        # SkillName id -> (group, subgroup, skill); only known for catalogs loaded from the tables
+        self.skill_paths = MappingProxyType(skill_paths or {})
+        # (key, label) pairs for skill dropdowns, keyed "group|subgroup|skill"
+        self.skill_choices = tuple(
+            (f"{group}|{subgroup}|{skill}", f"{group} > {subgroup} > {skill}")
+            for group, subgroup, skill in self.skills
+        )
+        self.skill_keys = frozenset(key for key, _ in self.skill_choices)
+
+    @staticmethod
+    def _build_index(groups):
+        """Map every (group, subgroup, skill) triple to its SkillEntry"""
+        index = {}
+        for group_pos, group in enumerate(groups):
+            for subgroup_pos, subgroup in enumerate(group.get('subgroups', ())):
+                for skill_pos, skill_item in enumerate(subgroup.get('skills', ())):
+                    key = (group['group'], subgroup['name'], skill_item['skill'])
+                    index[key] = SkillEntry(
+                        lessons=skill_item.get('lessons') or (),
+                        metadata=skill_item,
+                        position=(group_pos, subgroup_pos, skill_pos),
+                    )
+        return MappingProxyType(index)
+
+    def get_skill(self, group_name, subgroup_name, skill_name):
+        """Return the SkillEntry for a course, or None if it is not in the catalog"""
+        return self.skills.get((group_name, subgroup_name, skill_name))
+
+    @cached_property
+    def skill_ids(self):
+        """Map "group|subgroup|skill" keys to SkillName ids; empty for the file catalog"""
+        return MappingProxyType({'|'.join(path): skill_id for skill_id, path in self.skill_paths.items()})
+
+    @cached_property
+    def search_index(self):
+        """Search index for this catalog version, built on first use"""
+        return SearchIndex(self)
+
+    def __iter__(self):
+        return iter(self.groups)
+
+    def __len__(self):
+        return len(self.groups)
+
+    @classmethod
+    def load(cls, stamp):
+        """Load from the compiled snapshot, falling back to parsing the YAML"""
+        if stamp is None:
+            return cls((), stamp)
+        raw = _read_source(SKILLS_YAML_PATH)
+        version = content_hash(raw)
+        data = _load_snapshot(SKILLS_SNAPSHOT_PATH, version)
+        if data is None:
+            data = parse_yaml(raw)
+        return cls(_freeze(data), stamp, version)
+
+    @classmethod
+    def load_from_db(cls, db_version):
+        """Build the catalog from the rows load_skills synced, one query per level"""
+        from .models import SkillGroup, SkillSubgroup, SkillName
+
+        groups = list(SkillGroup.objects.filter(in_catalog=True).order_by('position', 'id').values_list('id', 'name'))
+        group_names = dict(groups)
+
+        subgroups = list(SkillSubgroup.objects.filter(in_catalog=True).order_by('position', 'id').values_list('id', 'group_id', 'name'))
+        subgroup_paths = {
+            subgroup_id: (group_names[group_id], name)
+            for subgroup_id, group_id, name in subgroups
+            if group_id in group_names
+        }
+
+        skills_by_subgroup = {}
+        skill_paths = {}
+        for skill_id, subgroup_id, name, lessons in SkillName.objects.filter(in_catalog=True).order_by('position', 'id').values_list(
+            'id', 'subgroup_id', 'name', 'lessons'
+        ):
+            skills_by_subgroup.setdefault(subgroup_id, []).append({'skill': name, 'lessons': lessons or []})
+            if subgroup_id in subgroup_paths:
+                skill_paths[skill_id] = (*subgroup_paths[subgroup_id], name)
+
+        subgroups_by_group = {}
+        for subgroup_id, group_id, name in subgroups:
+            subgroups_by_group.setdefault(group_id, []).append({
+                'name': name,
+                'skills': skills_by_subgroup.get(subgroup_id, []),
+            })
+
+        data = [
+            {'group': name, 'subgroups': subgroups_by_group.get(group_id, [])}
+            for group_id, name in groups
+        ]
+        return cls(_freeze(data), ('db', db_version), f"db-{db_version}", skill_paths)
+
+
+def get_file_catalog():
+    """Return the catalog from skills.yaml, reparsing only if the file changed"""
+    global _file_catalog
+    stamp = _file_stamp(SKILLS_YAML_PATH)
+    catalog = _file_catalog
+    if catalog is not None and catalog.stamp == stamp:
+        return catalog
+
+    with _lock:
+        if _file_catalog is None or _file_catalog.stamp != stamp:
+            _file_catalog = Catalog.load(stamp)
+        return _file_catalog
+
+
+def _current_db_version():
+    from .models import CatalogVersion
+    try:
+        return CatalogVersion.current()
+    except DatabaseError:
+        # Tables not migrated yet
+        return None
+
+
+def _load_catalog():
+    """Return the catalog for the current source stamp, reloading it if the stamp changed"""
+    global _db_catalog
+    db_version = _current_db_version()
+    if db_version is None:
+        return get_file_catalog()
+
+    stamp = ('db', db_version)
+    catalog = _db_catalog
+    if catalog is not None and catalog.stamp == stamp:
+        return catalog
+
+    with _lock:
+        if _db_catalog is None or _db_catalog.stamp != stamp:
+            _db_catalog = Catalog.load_from_db(db_version)
+        return _db_catalog
+
+
+def get_catalog():
+    """Return the shared catalog, reloading it only when its source changed
+
+    Reads the database tables once load_skills has stamped them, and
+    skills.yaml otherwise. The source is checked at most once every
+    CATALOG_CHECK_INTERVAL seconds per process, and within a request the
+    first catalog returned is reused for the rest of that request.
+    """
+    global _current_catalog, _checked_at
+    state = _request_state.get()
+    if state is not None and 'catalog' in state:
+        return state['catalog']
+
+    catalog = _current_catalog
+    now = time.monotonic()
+    if catalog is None or now - _checked_at >= getattr(settings, 'CATALOG_CHECK_INTERVAL', 5):
+        catalog = _load_catalog()
+        _current_catalog, _checked_at = catalog, now
+
+    if state is not None:
+        state['catalog'] = catalog
+    return catalog
+
+
+def pin_request_catalog():
+    """Start a per-request catalog pin; pass the token to unpin_request_catalog"""
+    return _request_state.set({})
+
+
+def unpin_request_catalog(token):
+    _request_state.reset(token)
@@ -1,13 +1,26 @@
-import yaml
-import os
-from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from . import week_calendar
+from .catalog import get_catalog
 
 def skills_context(request):
-    """Context processor to make skills data available to all templates"""
-    yaml_path = os.path.join(settings.BASE_DIR, 'firstapp', 'skills.yaml')
-    try:
-        with open(yaml_path, 'r') as file:
-            skills_data = yaml.safe_load(file)
-            return {'skills_data': skills_data}
-    except FileNotFoundError:
-        return {'skills_data': []}
\ No newline at end of file
+    """Context processor to make skills data available to all templates
+
+    The catalog is only materialised when a template actually uses
+    ``skills_data`` or ``skills_version``, and is memoised on the request
+    so several renders within one request share a single lookup.
+    """
+    context = getattr(request, '_skills_context', None)
+    if context is None:
+        catalog = SimpleLazyObject(get_catalog)
+        context = {
+            'skills_data': SimpleLazyObject(lambda: catalog.groups),
+            # Cache key for the navbar menu fragment in base.html
+            'skills_version': SimpleLazyObject(lambda: catalog.version),
+        }
+        request._skills_context = context
+    return context
+
+def week_calendar_context(request):
+    """Timeout for the cached week grid fragment in index.html"""
+    return {'calendar_cache_timeout': week_calendar.cache_timeout()}
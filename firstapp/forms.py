@@ -1,48 +1,10 @@
 from django import forms
 from .models import Skill, Profile
-import yaml
-import os
-from django.conf import settings
-
-def load_skills_yaml():
-    """Load skills data from YAML file"""
-    yaml_path = os.path.join(settings.BASE_DIR, 'firstapp', 'skills.yaml')
-    try:
-        with open(yaml_path, 'r') as file:
-            return yaml.safe_load(file)
-    except FileNotFoundError:
-        return []
+from .catalog import get_catalog
 
 def get_skill_choices():
-    """Generate choices for skills from YAML file"""
-    skills_data = load_skills_yaml()
-    choices = []
-    
-    for group in skills_data:
-        group_name = group['group']
-        for subgroup in group['subgroups']:
-            subgroup_name = subgroup['name']
-            for skill_item in subgroup['skills']:
-                skill_name = skill_item['skill']
-                # Create a unique identifier for each skill
-                skill_key = f"{group_name}|{subgroup_name}|{skill_name}"
-                skill_label = f"{group_name} > {subgroup_name} > {skill_name}"
-                choices.append((skill_key, skill_label))
-    
-    return choices
-
-def get_skill_lessons(group_name, subgroup_name, skill_name):
-    """Get lessons for a specific skill from YAML file"""
-    skills_data = load_skills_yaml()
-    
-    for group in skills_data:
-        if group['group'] == group_name:
-            for subgroup in group['subgroups']:
-                if subgroup['name'] == subgroup_name:
-                    for skill_item in subgroup['skills']:
-                        if skill_item['skill'] == skill_name:
-                            return skill_item.get('lessons', [])
-    return []
+    """Return the precomputed (key, label) skill choices from the catalog"""
+    return get_catalog().skill_choices
 
 class SkillForm(forms.Form):
     skill = forms.ChoiceField(
@@ -62,21 +24,18 @@ class SkillForm(forms.Form):
         user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
         
-        # Get all skill choices from YAML
-        all_choices = get_skill_choices()
+        catalog = get_catalog()
         
         # Filter out skills the user already has
         if user:
-            existing_skills = user.skill.all()
-            existing_skill_keys = set()
-            for skill in existing_skills:
-                skill_key = f"{skill.group}|{skill.subgroup}|{skill.name.name}"
-                existing_skill_keys.add(skill_key)
-            
-            # Remove existing skills from choices
-            available_choices = [choice for choice in all_choices if choice[0] not in existing_skill_keys]
+            existing_skill_keys = {
+                f"{group}|{subgroup}|{name}"
+                for group, subgroup, name in user.skill.values_list('group', 'subgroup', 'name__name')
+            }
+            available_keys = catalog.skill_keys - existing_skill_keys
+            available_choices = [choice for choice in catalog.skill_choices if choice[0] in available_keys]
         else:
-            available_choices = all_choices
+            available_choices = list(catalog.skill_choices)
         
         self.fields['skill'].choices = [('', 'Select a skill...')] + available_choices
 
@@ -97,6 +56,6 @@ class PrivateLessonForm(forms.Form):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Get all skills from YAML for dropdown
+        # Get all skills from the catalog for dropdown
         skill_choices = get_skill_choices()
-        self.fields['skill'].choices = [('', 'Select a skill...')] + skill_choices
\ No newline at end of file
+        self.fields['skill'].choices = [('', 'Select a skill...')] + list(skill_choices)
\ No newline at end of file
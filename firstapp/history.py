@@ -0,0 +1,149 @@
+"""
+Skill level history.
+
+Level changes are queued in an in-process outbox once the transaction
+that saved them commits, and the outbox is written with a single bulk
+INSERT when the request finishes (or as soon as it holds OUTBOX_LIMIT
+events). The same flush refreshes the SkillLevelDaily rollups for the
+(user, skill, day) keys it touched. Rollups are recomputed from the raw
+events rather than incremented, so workers flushing concurrently still
+converge on the same rows.
+"""
+
+import atexit
+import datetime
+import logging
+import threading
+
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from .models import SkillLevelDaily, SkillLevelEvent
+
+OUTBOX_LIMIT = 100
+OUTBOX_MAX = 1000  # Events kept for a retry while the database is failing; older ones are dropped
+PROGRESS_DAYS = 30
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_outbox = []
+
+
+def record_level_changes(changes):
+    """Queue (user_id, skill_id, old_level, new_level) changes for the history log
+
+    The events are only queued if the current transaction commits.
+    """
+    now = timezone.now()
+    events = [
+        SkillLevelEvent(user_id=user_id, skill_id=skill_id, old_level=old_level, new_level=new_level, created_at=now)
+        for user_id, skill_id, old_level, new_level in changes
+        if old_level != new_level
+    ]
+    if events:
+        transaction.on_commit(lambda: _enqueue(events))
+
+
+def record_level_change(user_id, skill_id, old_level, new_level):
+    record_level_changes([(user_id, skill_id, old_level, new_level)])
+
+
+def _enqueue(events):
+    with _lock:
+        _outbox.extend(events)
+        full = len(_outbox) >= OUTBOX_LIMIT
+    if full:
+        flush()
+
+
+def flush():
+    """Write queued events in one bulk INSERT and refresh their daily rollups
+
+    Runs from request_finished, so database errors are logged rather than
+    raised; unwritten events are kept for the next flush, up to OUTBOX_MAX.
+    """
+    global _outbox
+    with _lock:
+        events, _outbox = _outbox, []
+    if not events:
+        return 0
+
+    try:
+        SkillLevelEvent.objects.bulk_create(events)
+    except DatabaseError:
+        with _lock:
+            _outbox[:0] = events
+            dropped = max(len(_outbox) - OUTBOX_MAX, 0)
+            del _outbox[:dropped]
+        logger.exception(
+            "Could not write %d skill level events; keeping them for the next flush (%d oldest dropped)",
+            len(events), dropped,
+        )
+        return 0
+
+    try:
+        _refresh_rollups(events)
+    except DatabaseError:
+        # The events are stored, so the next flush touching these days recomputes the rollups
+        logger.exception("Could not refresh the skill level rollups for %d events", len(events))
+    return len(events)
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def _refresh_rollups(events):
+    """Recompute the rollup rows for every (user, skill, day) the events fall on"""
+    keys = {(event.user_id, event.skill_id, timezone.localdate(event.created_at)) for event in events}
+    days = {day for _, _, day in keys}
+
+    rows = SkillLevelEvent.objects.filter(
+        user_id__in={user_id for user_id, _, _ in keys},
+        skill_id__in={skill_id for _, skill_id, _ in keys},
+        created_at__gte=_day_start(min(days)),
+        created_at__lt=_day_start(max(days) + datetime.timedelta(days=1)),
+    ).order_by('created_at', 'id').values_list('user_id', 'skill_id', 'old_level', 'new_level', 'created_at')
+
+    rollups = {}
+    for user_id, skill_id, old_level, new_level, created_at in rows:
+        key = (user_id, skill_id, timezone.localdate(created_at))
+        if key not in keys:
+            continue
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollups[key] = SkillLevelDaily(
+                user_id=user_id, skill_id=skill_id, day=key[2],
+                open_level=old_level, close_level=new_level, change_count=1,
+            )
+        else:
+            rollup.close_level = new_level
+            rollup.change_count += 1
+
+    SkillLevelDaily.objects.bulk_create(
+        rollups.values(),
+        update_conflicts=True,
+        unique_fields=['user', 'skill', 'day'],
+        update_fields=['open_level', 'close_level', 'change_count'],
+    )
+
+
+def flush_on_request_finished(sender, **kwargs):
+    flush()
+
+
+atexit.register(flush)
+
+
+def progress_for_user(user, days=PROGRESS_DAYS):
+    """Map SkillName id -> {'points': [(day, level)], 'change': int} from the daily rollups"""
+    since = timezone.localdate() - datetime.timedelta(days=days - 1)
+    progress = {}
+    for skill_id, day, open_level, close_level in SkillLevelDaily.objects.filter(
+        user=user, day__gte=since
+    ).values_list('skill_id', 'day', 'open_level', 'close_level'):
+        entry = progress.setdefault(skill_id, {'points': [], 'start': open_level})
+        entry['points'].append((day, close_level))
+        entry['change'] = close_level - entry['start']
+    return progress
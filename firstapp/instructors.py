@@ -0,0 +1,38 @@
+"""
+Instructor pool for private lessons.
+
+Bookings go to the least-loaded staff instructor who is not already
+teaching in the booked slot, ties going to the lowest id, so equal loads
+rotate round-robin. A slot where every instructor is busy gets no
+instructor rather than a double booking. The load is the instructor's
+number of upcoming active private lessons. It is computed together with
+the busy flag in one aggregate query per booking, so every worker sees
+the same loads without a shared cache.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Q
+from django.utils import timezone
+
+
+def pick_instructor(slot_date, slot_time):
+    """Return the id of the instructor for a private lesson in the slot
+
+    Returns None when there is no staff or every instructor is already teaching in the slot.
+    """
+    pool = list(get_user_model().objects.filter(is_staff=True, is_active=True).annotate(
+        load=Count('scheduled_courses', filter=Q(
+            scheduled_courses__is_private=True,
+            scheduled_courses__is_active=True,
+            scheduled_courses__scheduled_date__gte=timezone.localdate(),
+        )),
+        busy=Count('scheduled_courses', filter=Q(
+            scheduled_courses__is_active=True,
+            scheduled_courses__scheduled_date=slot_date,
+            scheduled_courses__scheduled_time=slot_time,
+        )),
+    ).values_list('id', 'load', 'busy'))
+    free = [row for row in pool if not row[2]]
+    if not free:
+        return None
+    return min(free, key=lambda row: (row[1], row[0]))[0]
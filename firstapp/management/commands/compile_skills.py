@@ -0,0 +1,12 @@
+import os
+from django.core.management.base import BaseCommand
+from firstapp.catalog import SKILLS_SNAPSHOT_PATH, compile_snapshot
+
+class Command(BaseCommand):
+    help = 'Compile skills.yaml into a JSON snapshot that workers load without PyYAML'
+
+    def handle(self, *args, **kwargs):
+        digest, groups = compile_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f'Compiled {len(groups)} skill groups to {os.path.relpath(SKILLS_SNAPSHOT_PATH)} (sha256 {digest[:12]})'
+        ))
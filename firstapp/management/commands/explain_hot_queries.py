@@ -0,0 +1,51 @@
+"""
+Print the database's EXPLAIN plan for the queries the busiest views run
+Usage: python manage.py explain_hot_queries [--analyze]
+"""
+
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db import connection
+from firstapp.models import CourseAttendance, CourseEnrollmentRequest, ScheduledCourse
+
+
+def hot_queries():
+    """(label, queryset) pairs mirroring the filters used by the views"""
+    week_start = date.today() - timedelta(days=date.today().weekday())
+    week_end = week_start + timedelta(days=6)
+    some_course = ScheduledCourse.objects.values_list('id', flat=True).first() or 0
+
+    return [
+        ('index: week of active courses', ScheduledCourse.objects.filter(
+            is_active=True,
+            scheduled_date__gte=week_start,
+            scheduled_date__lte=week_end
+        ).order_by('scheduled_date', 'scheduled_time')),
+        ('course_management: pending requests', CourseEnrollmentRequest.objects.filter(
+            status='pending'
+        ).order_by('-requested_at')),
+        ('course_management: recently reviewed', CourseEnrollmentRequest.objects.filter(
+            status__in=['approved', 'rejected']
+        ).order_by('-reviewed_at')[:20]),
+        ('attendance for a scheduled course', CourseAttendance.objects.filter(
+            scheduled_course_id=some_course
+        ).values_list('student_id', flat=True)),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN on the hot view queries to confirm they use the composite indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Execute the queries and report actual timings (EXPLAIN ANALYZE, where supported)',
+        )
+
+    def handle(self, *args, **options):
+        explain_options = {'analyze': True} if options['analyze'] and connection.vendor == 'postgresql' else {}
+        for label, queryset in hot_queries():
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write('')
@@ -1,19 +1,206 @@
-import yaml
+import time
 from django.core.management.base import BaseCommand
-from firstapp.models import SkillGroup, SkillSubgroup, SkillName
+from django.db import transaction
+from firstapp.catalog import get_file_catalog
+from firstapp.models import (
+    ApprovedCourseEnrollment, CatalogVersion, CourseEnrollmentRequest, ScheduledCourse, SkillGroup, SkillName,
+    SkillSubgroup,
+)
 
 class Command(BaseCommand):
-    help = 'Load skill groups, subgroups, and skill names from skills.yaml'
-
-    def handle(self, *args, **kwargs):
-        with open('firstapp/skills.yaml', 'r') as f:
-            data = yaml.safe_load(f)
-        for group_data in data:
-            group, _ = SkillGroup.objects.get_or_create(name=group_data['group'])
-            for subgroup_data in group_data.get('subgroups', []):
-                subgroup, _ = SkillSubgroup.objects.get_or_create(group=group, name=subgroup_data['name'])
-                for skill_data in subgroup_data.get('skills', []):
-                    # Extract the skill name from the skill dictionary
-                    skill_name = skill_data['skill']
-                    SkillName.objects.get_or_create(subgroup=subgroup, name=skill_name)
-        self.stdout.write(self.style.SUCCESS('Skills loaded'))
\ No newline at end of file
+    help = 'Sync skill groups, subgroups, skill names and lessons from skills.yaml'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Delete groups, subgroups and skill names that are no longer in skills.yaml '
+                 '(this also deletes user skills pointing at them). Skill names that enrollments '
+                 'or sessions still use are kept. Without it they are only taken out of the catalog',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report what would change, without writing to the database',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        catalog = get_file_catalog()
+
+        # Desired state, keyed by name paths: group/subgroup -> position, skill -> (position, lessons)
+        wanted_groups = {}
+        wanted_subgroups = {}
+        wanted_skills = {}
+        for group_pos, group_data in enumerate(catalog.groups):
+            group = group_data['group']
+            wanted_groups.setdefault(group, group_pos)
+            for subgroup_pos, subgroup_data in enumerate(group_data.get('subgroups', ())):
+                wanted_subgroups.setdefault((group, subgroup_data['name']), subgroup_pos)
+                for skill_pos, skill_data in enumerate(subgroup_data.get('skills', ())):
+                    key = (group, subgroup_data['name'], skill_data['skill'])
+                    wanted_skills.setdefault(key, (skill_pos, list(skill_data.get('lessons') or ())))
+
+        # Existing state, one query per level
+        existing_groups = self._existing(SkillGroup.objects.values_list('name', 'id', 'position', 'in_catalog'), 1)
+        existing_subgroups = self._existing(
+            SkillSubgroup.objects.values_list('group__name', 'name', 'id', 'position', 'in_catalog'), 2
+        )
+        existing_skills = self._existing(
+            SkillName.objects.values_list(
+                'subgroup__group__name', 'subgroup__name', 'name', 'id', 'position', 'lessons', 'in_catalog'
+            ), 3
+        )
+
+        new_groups = sorted(wanted_groups.keys() - existing_groups.keys())
+        new_subgroups = sorted(wanted_subgroups.keys() - existing_subgroups.keys())
+        new_skills = sorted(wanted_skills.keys() - existing_skills.keys())
+
+        # Rows in skills.yaml whose position or lessons moved, or that were not flagged in_catalog yet
+        changed_groups = [
+            SkillGroup(id=pk, position=wanted_groups[name], in_catalog=True)
+            for name, (pk, position, in_catalog) in existing_groups.items()
+            if name in wanted_groups and (position, in_catalog) != (wanted_groups[name], True)
+        ]
+        changed_subgroups = [
+            SkillSubgroup(id=pk, position=wanted_subgroups[key], in_catalog=True)
+            for key, (pk, position, in_catalog) in existing_subgroups.items()
+            if key in wanted_subgroups and (position, in_catalog) != (wanted_subgroups[key], True)
+        ]
+        changed_skills = [
+            SkillName(id=pk, position=wanted_skills[key][0], lessons=wanted_skills[key][1], in_catalog=True)
+            for key, (pk, position, lessons, in_catalog) in existing_skills.items()
+            if key in wanted_skills and (position, lessons, in_catalog) != (*wanted_skills[key], True)
+        ]
+
+        # Rows no longer in skills.yaml: deleted with --prune, otherwise only taken out of the catalog
+        stale_groups = {name for name in existing_groups if name not in wanted_groups}
+        stale_subgroups = {key for key in existing_subgroups if key not in wanted_subgroups}
+        stale_skills = {key for key in existing_skills if key not in wanted_skills}
+
+        deleted_groups, deleted_subgroups, deleted_skills = set(), set(), set()
+        if options['prune']:
+            # Course records protect their skill name, so those rows and their parents are kept
+            protected = self._with_course_records({existing_skills[key][0]: key for key in stale_skills})
+            for group, subgroup, name in sorted(protected):
+                self.stdout.write(self.style.WARNING(
+                    f'Keeping {group} > {subgroup} > {name}: it still has course records'
+                ))
+            deleted_skills = stale_skills - protected
+            deleted_subgroups = stale_subgroups - {key[:2] for key in protected}
+            deleted_groups = stale_groups - {key[0] for key in protected}
+
+        def delisted(stale, deleted, existing):
+            return {key for key in stale - deleted if existing[key][-1]}
+
+        delisted_groups = delisted(stale_groups, deleted_groups, existing_groups)
+        delisted_subgroups = delisted(stale_subgroups, deleted_subgroups, existing_subgroups)
+        delisted_skills = delisted(stale_skills, deleted_skills, existing_skills)
+
+        self.stdout.write(
+            f'Groups: +{len(new_groups)} ~{len(changed_groups)} -{len(deleted_groups | delisted_groups)}, '
+            f'subgroups: +{len(new_subgroups)} ~{len(changed_subgroups)} -{len(deleted_subgroups | delisted_subgroups)}, '
+            f'skills: +{len(new_skills)} ~{len(changed_skills)} -{len(deleted_skills | delisted_skills)}'
+        )
+
+        has_changes = any([
+            new_groups, new_subgroups, new_skills,
+            changed_groups, changed_subgroups, changed_skills,
+            deleted_groups, deleted_subgroups, deleted_skills,
+            delisted_groups, delisted_subgroups, delisted_skills,
+        ])
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(
+                f'Dry run, no changes written ({time.perf_counter() - started:.3f}s)'
+            ))
+            return
+
+        with transaction.atomic():
+            if new_groups:
+                SkillGroup.objects.bulk_create(
+                    SkillGroup(name=name, position=wanted_groups[name], in_catalog=True) for name in new_groups
+                )
+                existing_groups = self._existing(SkillGroup.objects.values_list('name', 'id'), 1)
+
+            if new_subgroups:
+                SkillSubgroup.objects.bulk_create(
+                    SkillSubgroup(
+                        group_id=existing_groups[group][0],
+                        name=name,
+                        position=wanted_subgroups[(group, name)],
+                        in_catalog=True,
+                    )
+                    for group, name in new_subgroups
+                )
+                existing_subgroups = self._existing(SkillSubgroup.objects.values_list('group__name', 'name', 'id'), 2)
+
+            if new_skills:
+                SkillName.objects.bulk_create(
+                    SkillName(
+                        subgroup_id=existing_subgroups[(group, subgroup)][0],
+                        name=name,
+                        position=wanted_skills[(group, subgroup, name)][0],
+                        lessons=wanted_skills[(group, subgroup, name)][1],
+                        in_catalog=True,
+                    )
+                    for group, subgroup, name in new_skills
+                )
+
+            if changed_groups:
+                SkillGroup.objects.bulk_update(changed_groups, ['position', 'in_catalog'])
+            if changed_subgroups:
+                SkillSubgroup.objects.bulk_update(changed_subgroups, ['position', 'in_catalog'])
+            if changed_skills:
+                SkillName.objects.bulk_update(changed_skills, ['position', 'lessons', 'in_catalog'])
+
+            # Delete children first so each level reports its own rows
+            if deleted_skills:
+                SkillName.objects.filter(id__in=self._ids(existing_skills, deleted_skills)).delete()
+            if deleted_subgroups:
+                SkillSubgroup.objects.filter(id__in=self._ids(existing_subgroups, deleted_subgroups)).delete()
+            if deleted_groups:
+                SkillGroup.objects.filter(id__in=self._ids(existing_groups, deleted_groups)).delete()
+
+            if delisted_skills:
+                SkillName.objects.filter(id__in=self._ids(existing_skills, delisted_skills)).update(in_catalog=False)
+            if delisted_subgroups:
+                SkillSubgroup.objects.filter(
+                    id__in=self._ids(existing_subgroups, delisted_subgroups)
+                ).update(in_catalog=False)
+            if delisted_groups:
+                SkillGroup.objects.filter(id__in=self._ids(existing_groups, delisted_groups)).update(in_catalog=False)
+
+            # Tell every worker to reload the catalog from the tables
+            if has_changes or CatalogVersion.current() is None:
+                version = CatalogVersion.bump(source_hash=catalog.version or '')
+                self.stdout.write(f'Catalog version bumped to {version}')
+
+        self.stdout.write(self.style.SUCCESS(f'Skills loaded ({time.perf_counter() - started:.3f}s)'))
+
+    @staticmethod
+    def _ids(existing, keys):
+        return [existing[key][0] for key in keys]
+
+    @staticmethod
+    def _with_course_records(skill_keys):
+        """Return the name paths of the given {SkillName id: path} that enrollments or sessions point at"""
+        skill_ids = list(skill_keys)
+        referenced = set()
+        for model in (CourseEnrollmentRequest, ApprovedCourseEnrollment, ScheduledCourse):
+            referenced.update(model.objects.filter(course_id__in=skill_ids).values_list('course_id', flat=True))
+        return {skill_keys[skill_id] for skill_id in referenced}
+
+    @staticmethod
+    def _existing(rows, depth):
+        """Map the name path of each row to its (id, *extra columns), keeping the first duplicate
+
+        The name path is the first ``depth`` columns: a plain name for groups,
+        a tuple of names for subgroups and skill names.
+        """
+        existing = {}
+        for row in rows:
+            names, values = row[:depth], row[depth:]
+            key = names[0] if len(names) == 1 else tuple(names)
+            existing.setdefault(key, values)
+        return existing
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from firstapp.models import ApprovedCourseEnrollment, CourseEnrollmentCount, ScheduledCourse
+
+class Command(BaseCommand):
+    help = ('Recount CourseAttendance and ApprovedCourseEnrollment rows and fix '
+            'ScheduledCourse.enrolled_count and CourseEnrollmentCount where they have drifted')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report drifted counters, without fixing them',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        # Seats taken per scheduled session
+        drifted_sessions = [
+            (course_id, stored, actual)
+            for course_id, stored, actual in ScheduledCourse.objects.annotate(
+                actual=Count('courseattendance')
+            ).values_list('id', 'enrolled_count', 'actual')
+            if stored != actual
+        ]
+        for course_id, stored, actual in drifted_sessions:
+            self.stdout.write(f'Scheduled course {course_id}: stored {stored}, actual {actual}')
+            if not dry_run:
+                ScheduledCourse.objects.filter(pk=course_id).update(enrolled_count=actual)
+
+        # Approved enrollments per course
+        actual_counts = dict(
+            ApprovedCourseEnrollment.objects.order_by().values_list('course').annotate(total=Count('id'))
+        )
+        stored_counts = dict(CourseEnrollmentCount.objects.values_list('course_id', 'count'))
+        drifted_courses = [
+            (course_id, stored_counts.get(course_id, 0), actual_counts.get(course_id, 0))
+            for course_id in actual_counts.keys() | stored_counts.keys()
+            if stored_counts.get(course_id, 0) != actual_counts.get(course_id, 0)
+        ]
+        for course_id, stored, actual in drifted_courses:
+            self.stdout.write(f'Course {course_id} enrollments: stored {stored}, actual {actual}')
+            if not dry_run:
+                CourseEnrollmentCount.objects.update_or_create(pk=course_id, defaults={'count': actual})
+
+        total = len(drifted_sessions) + len(drifted_courses)
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f'{total} counters drifted, dry run, nothing changed'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Repaired {total} counters'))
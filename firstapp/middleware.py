@@ -0,0 +1,18 @@
+from .catalog import pin_request_catalog, unpin_request_catalog
+
+class CatalogMiddleware:
+    """Give each request a consistent catalog while workers hot-reload it
+
+    The first get_catalog() call in a request pins that catalog version,
+    so a reload swapping in a new catalog only affects later requests.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = pin_request_catalog()
+        try:
+            return self.get_response(request)
+        finally:
+            unpin_request_catalog(token)
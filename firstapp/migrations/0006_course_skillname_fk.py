@@ -0,0 +1,51 @@
+# Generated by Django 4.2.17 on 2026-10-18 09:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firstapp', '0005_catalogversion_skill_positions_and_lessons'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courseenrollmentrequest',
+            name='course',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_set', to='firstapp.skillname'),
+        ),
+        migrations.AddField(
+            model_name='approvedcourseenrollment',
+            name='course',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_set', to='firstapp.skillname'),
+        ),
+        migrations.AddField(
+            model_name='scheduledcourse',
+            name='course',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='scheduled_courses', to='firstapp.skillname'),
+        ),
+        migrations.AddField(
+            model_name='scheduledcourse',
+            name='is_private',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='scheduledcourse',
+            name='private_label',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AlterUniqueTogether(
+            name='courseenrollmentrequest',
+            unique_together={('user', 'course')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='approvedcourseenrollment',
+            unique_together={('user', 'course')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='scheduledcourse',
+            unique_together={('course', 'private_label', 'scheduled_date', 'scheduled_time')},
+        ),
+    ]
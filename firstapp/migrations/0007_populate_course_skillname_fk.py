@@ -0,0 +1,73 @@
+# Generated by Django 4.2.17 on 2026-10-18 09:00
+
+from django.db import migrations
+
+PRIVATE_LESSON_GROUP = "Private Lesson"
+
+
+def link_courses(apps, schema_editor):
+    """Point every course row at the SkillName matching its three name columns"""
+    SkillGroup = apps.get_model('firstapp', 'SkillGroup')
+    SkillSubgroup = apps.get_model('firstapp', 'SkillSubgroup')
+    SkillName = apps.get_model('firstapp', 'SkillName')
+
+    course_ids = {
+        (group, subgroup, name): pk
+        for pk, name, subgroup, group in SkillName.objects.values_list(
+            'id', 'name', 'subgroup__name', 'subgroup__group__name'
+        )
+    }
+
+    def resolve(group, subgroup, name):
+        # Courses that are no longer in the catalog get their SkillName recreated
+        key = (group, subgroup, name)
+        if key not in course_ids:
+            skill_group, _ = SkillGroup.objects.get_or_create(name=group)
+            skill_subgroup, _ = SkillSubgroup.objects.get_or_create(group=skill_group, name=subgroup)
+            skill_name, _ = SkillName.objects.get_or_create(subgroup=skill_subgroup, name=name)
+            course_ids[key] = skill_name.id
+        return course_ids[key]
+
+    for model_name in ['CourseEnrollmentRequest', 'ApprovedCourseEnrollment']:
+        model = apps.get_model('firstapp', model_name)
+        for row in model.objects.all():
+            row.course_id = resolve(row.skill_group, row.skill_subgroup, row.skill_name)
+            row.save(update_fields=['course'])
+
+    ScheduledCourse = apps.get_model('firstapp', 'ScheduledCourse')
+    for row in ScheduledCourse.objects.all():
+        if row.skill_group == PRIVATE_LESSON_GROUP:
+            # Private lessons stored the chosen skill in skill_subgroup and the student in skill_name
+            row.is_private = True
+            row.private_label = row.skill_name
+            row.course_id = SkillName.objects.filter(name=row.skill_subgroup).values_list('id', flat=True).first()
+        else:
+            row.course_id = resolve(row.skill_group, row.skill_subgroup, row.skill_name)
+        row.save(update_fields=['course', 'is_private', 'private_label'])
+
+
+def unlink_courses(apps, schema_editor):
+    """Copy the course path back into the three name columns"""
+    for model_name in ['CourseEnrollmentRequest', 'ApprovedCourseEnrollment', 'ScheduledCourse']:
+        model = apps.get_model('firstapp', model_name)
+        for row in model.objects.select_related('course__subgroup__group'):
+            if getattr(row, 'is_private', False):
+                row.skill_group = PRIVATE_LESSON_GROUP
+                row.skill_subgroup = row.course.name if row.course else "General Skills"
+                row.skill_name = row.private_label
+            else:
+                row.skill_group = row.course.subgroup.group.name
+                row.skill_subgroup = row.course.subgroup.name
+                row.skill_name = row.course.name
+            row.save(update_fields=['skill_group', 'skill_subgroup', 'skill_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firstapp', '0006_course_skillname_fk'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_courses, unlink_courses),
+    ]
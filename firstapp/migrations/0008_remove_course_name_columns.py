@@ -0,0 +1,106 @@
+# Generated by Django 4.2.17 on 2026-10-18 09:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firstapp', '0007_populate_course_skillname_fk'),
+    ]
+
+    operations = [
+        # Give the old columns a default so the migration can be reversed
+        migrations.AlterField(
+            model_name='approvedcourseenrollment',
+            name='skill_group',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='approvedcourseenrollment',
+            name='skill_name',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='approvedcourseenrollment',
+            name='skill_subgroup',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='courseenrollmentrequest',
+            name='skill_group',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='courseenrollmentrequest',
+            name='skill_name',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='courseenrollmentrequest',
+            name='skill_subgroup',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='scheduledcourse',
+            name='skill_group',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='scheduledcourse',
+            name='skill_name',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='scheduledcourse',
+            name='skill_subgroup',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='courseenrollmentrequest',
+            name='course',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_set', to='firstapp.skillname'),
+        ),
+        migrations.AlterField(
+            model_name='approvedcourseenrollment',
+            name='course',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_set', to='firstapp.skillname'),
+        ),
+        migrations.RemoveField(
+            model_name='approvedcourseenrollment',
+            name='skill_group',
+        ),
+        migrations.RemoveField(
+            model_name='approvedcourseenrollment',
+            name='skill_name',
+        ),
+        migrations.RemoveField(
+            model_name='approvedcourseenrollment',
+            name='skill_subgroup',
+        ),
+        migrations.RemoveField(
+            model_name='courseenrollmentrequest',
+            name='skill_group',
+        ),
+        migrations.RemoveField(
+            model_name='courseenrollmentrequest',
+            name='skill_name',
+        ),
+        migrations.RemoveField(
+            model_name='courseenrollmentrequest',
+            name='skill_subgroup',
+        ),
+        migrations.RemoveField(
+            model_name='scheduledcourse',
+            name='skill_group',
+        ),
+        migrations.RemoveField(
+            model_name='scheduledcourse',
+            name='skill_name',
+        ),
+        migrations.RemoveField(
+            model_name='scheduledcourse',
+            name='skill_subgroup',
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.17 on 2026-10-18 06:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firstapp', '0008_remove_course_name_columns'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='courseattendance',
+            index=models.Index(fields=['scheduled_course', 'student'], name='attendance_course_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='courseenrollmentrequest',
+            index=models.Index(fields=['status', 'requested_at'], name='enroll_req_status_req_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='courseenrollmentrequest',
+            index=models.Index(fields=['status', 'reviewed_at'], name='enroll_req_status_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scheduledcourse',
+            index=models.Index(fields=['is_active', 'scheduled_date', 'scheduled_time'], name='sched_active_date_time_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.17 on 2026-10-18 06:22
+
+from django.db import migrations, models
+
+
+def count_enrollments(apps, schema_editor):
+    ScheduledCourse = apps.get_model('firstapp', 'ScheduledCourse')
+    for course in ScheduledCourse.objects.annotate(actual=models.Count('courseattendance')):
+        if course.actual:
+            ScheduledCourse.objects.filter(pk=course.pk).update(enrolled_count=course.actual)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firstapp', '0009_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledcourse',
+            name='enrolled_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Enrolled Students'),
+        ),
+        migrations.RunPython(count_enrollments, migrations.RunPython.noop),
+    ]
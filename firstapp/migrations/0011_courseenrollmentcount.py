@@ -0,0 +1,31 @@
+# Generated by Django 4.2.17 on 2026-10-18 06:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def count_enrollments(apps, schema_editor):
+    ApprovedCourseEnrollment = apps.get_model('firstapp', 'ApprovedCourseEnrollment')
+    CourseEnrollmentCount = apps.get_model('firstapp', 'CourseEnrollmentCount')
+    CourseEnrollmentCount.objects.bulk_create(
+        CourseEnrollmentCount(course_id=row['course'], count=row['total'])
+        for row in ApprovedCourseEnrollment.objects.order_by().values('course').annotate(total=models.Count('id'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firstapp', '0010_scheduledcourse_enrolled_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseEnrollmentCount',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='enrollment_count', serialize=False, to='firstapp.skillname')),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(count_enrollments, migrations.RunPython.noop),
+    ]
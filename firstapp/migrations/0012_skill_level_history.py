@@ -0,0 +1,47 @@
+# Generated by Django 4.2.17 on 2026-10-18 06:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firstapp', '0011_courseenrollmentcount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillLevelEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('old_level', models.PositiveSmallIntegerField()),
+                ('new_level', models.PositiveSmallIntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='level_events', to='firstapp.skillname')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_level_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'skill', 'created_at'], name='skillevent_user_skill_time_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillLevelDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('open_level', models.PositiveSmallIntegerField()),
+                ('close_level', models.PositiveSmallIntegerField()),
+                ('change_count', models.PositiveIntegerField(default=0)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='level_days', to='firstapp.skillname')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_level_days', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['user', 'day'], name='skillday_user_day_idx')],
+                'unique_together': {('user', 'skill', 'day')},
+            },
+        ),
+    ]
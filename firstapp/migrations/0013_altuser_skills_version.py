@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-18 06:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firstapp', '0012_skill_level_history'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='altuser',
+            name='skills_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.17 on 2026-10-18 06:32
+
+from django.db import migrations, models
+
+
+def deactivate_double_bookings(apps, schema_editor):
+    """Keep the earliest booking of each private slot active so the constraint can be added"""
+    ScheduledCourse = apps.get_model('firstapp', 'ScheduledCourse')
+    seen = set()
+    duplicates = []
+    for pk, slot_date, slot_time in ScheduledCourse.objects.filter(
+        is_private=True, is_active=True
+    ).order_by('created_at', 'id').values_list('id', 'scheduled_date', 'scheduled_time'):
+        if (slot_date, slot_time) in seen:
+            duplicates.append(pk)
+        else:
+            seen.add((slot_date, slot_time))
+    ScheduledCourse.objects.filter(id__in=duplicates).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firstapp', '0013_altuser_skills_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(deactivate_double_bookings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='scheduledcourse',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True), ('is_private', True)), fields=('scheduled_date', 'scheduled_time'), name='unique_active_private_slot'),
+        ),
+    ]
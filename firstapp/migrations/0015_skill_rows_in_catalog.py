@@ -0,0 +1,53 @@
+# Generated by Django 4.2.17 on 2026-10-18 06:40
+
+from django.db import migrations, models
+
+
+def flag_catalog_rows(apps, schema_editor):
+    """Flag the rows that are in skills.yaml and make every worker reload the catalog"""
+    from firstapp.catalog import get_file_catalog
+    SkillGroup = apps.get_model('firstapp', 'SkillGroup')
+    SkillSubgroup = apps.get_model('firstapp', 'SkillSubgroup')
+    SkillName = apps.get_model('firstapp', 'SkillName')
+    CatalogVersion = apps.get_model('firstapp', 'CatalogVersion')
+
+    wanted = set(get_file_catalog().skills)
+    skill_ids, subgroup_ids, group_ids = set(), set(), set()
+    for skill_id, subgroup_id, group_id, group, subgroup, name in SkillName.objects.values_list(
+        'id', 'subgroup_id', 'subgroup__group_id', 'subgroup__group__name', 'subgroup__name', 'name'
+    ):
+        if (group, subgroup, name) in wanted:
+            skill_ids.add(skill_id)
+            subgroup_ids.add(subgroup_id)
+            group_ids.add(group_id)
+
+    SkillName.objects.filter(id__in=skill_ids).update(in_catalog=True)
+    SkillSubgroup.objects.filter(id__in=subgroup_ids).update(in_catalog=True)
+    SkillGroup.objects.filter(id__in=group_ids).update(in_catalog=True)
+    CatalogVersion.objects.update(version=models.F('version') + 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firstapp', '0014_unique_active_private_slot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skillgroup',
+            name='in_catalog',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='skillname',
+            name='in_catalog',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='skillsubgroup',
+            name='in_catalog',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(flag_catalog_rows, migrations.RunPython.noop),
+    ]
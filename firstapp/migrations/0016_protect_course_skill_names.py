@@ -0,0 +1,29 @@
+# Generated by Django 4.2.17 on 2026-10-18 06:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firstapp', '0015_skill_rows_in_catalog'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='approvedcourseenrollment',
+            name='course',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_set', to='firstapp.skillname'),
+        ),
+        migrations.AlterField(
+            model_name='courseenrollmentrequest',
+            name='course',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_set', to='firstapp.skillname'),
+        ),
+        migrations.AlterField(
+            model_name='scheduledcourse',
+            name='course',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='scheduled_courses', to='firstapp.skillname'),
+        ),
+    ]
@@ -1,18 +1,32 @@
 from django.contrib.auth.models import AbstractUser
+from django.core.cache import cache
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 
 # Constants
 MAX_PARTICIPANTS_PER_COURSE = 16
+COMPLETED_SKILL_LEVEL = 80  # Skills at this level or above count as completed
+PROFILE_SUMMARY_TIMEOUT = 60 * 60 * 24
 
 def user_profile_picture_path(instance, filename):
     """Generate upload path for user profile pictures"""
     return f'profile_pics/{instance.user.username}_{filename}'
 
 class AltUser(AbstractUser):
+    # Bumped on every change to the user's skills; keys the cached profile summary
+    skills_version = models.PositiveIntegerField(default=0, editable=False)
 
     def get_skills(self):
+        """Return {group: {subgroup: [skills]}}, loaded once per user object
+
+        request.user lives for one request, so repeated calls in views and
+        templates share a single joined query.
+        """
+        if hasattr(self, '_grouped_skills'):
+            return self._grouped_skills
         grouped = {}
-        for skill in self.skill.all():
+        for skill in self.skill.select_related('name__subgroup__group'):
             group = skill.name.subgroup.group.name
             subgroup = skill.name.subgroup.name
             if group not in grouped:
@@ -20,7 +34,34 @@ class AltUser(AbstractUser):
             if subgroup not in grouped[group]:
                 grouped[group][subgroup] = []
             grouped[group][subgroup].append(skill)
+        self._grouped_skills = grouped
         return grouped
+
+    def get_profile_summary(self):
+        """Return the cached {'skills': grouped skills, 'total': n, 'completed': n} for the profile
+
+        The cache key holds skills_version, which arrives with request.user,
+        so a skill change invalidates the summary in every worker without
+        an extra query.
+        """
+        from .catalog import get_catalog
+        key = f"profile_summary:{self.pk}:{self.skills_version}:{get_catalog().version}"
+        summary = cache.get(key)
+        if summary is None:
+            grouped = self.get_skills()
+            levels = [skill.level for subgroups in grouped.values() for skills in subgroups.values() for skill in skills]
+            summary = {
+                'skills': grouped,
+                'total': len(levels),
+                'completed': sum(level >= COMPLETED_SKILL_LEVEL for level in levels),
+            }
+            cache.set(key, summary, PROFILE_SUMMARY_TIMEOUT)
+        return summary
+
+    @classmethod
+    def bump_skills_version(cls, user_id):
+        """Invalidate the user's cached profile summary"""
+        cls.objects.filter(pk=user_id).update(skills_version=F('skills_version') + 1)
     
 class Profile(models.Model):
     user = models.OneToOneField(AltUser, on_delete=models.CASCADE)
@@ -37,6 +78,8 @@ class Profile(models.Model):
     
 class SkillGroup(models.Model):
     name = models.CharField(max_length=200)
+    position = models.PositiveIntegerField(default=0)  # Order in skills.yaml
+    in_catalog = models.BooleanField(default=False)  # Set by load_skills for rows present in skills.yaml
 
     def __str__(self):
         return self.name
@@ -44,6 +87,8 @@ class SkillGroup(models.Model):
 class SkillSubgroup(models.Model):
     group = models.ForeignKey(SkillGroup, on_delete=models.CASCADE, related_name='skill_subgroups')
     name = models.CharField(max_length=200)
+    position = models.PositiveIntegerField(default=0)
+    in_catalog = models.BooleanField(default=False)
 
     def __str__(self):
         return f"{self.name}"
@@ -51,10 +96,53 @@ class SkillSubgroup(models.Model):
 class SkillName(models.Model):
     subgroup = models.ForeignKey(SkillSubgroup, on_delete=models.CASCADE, related_name='skill_names')
     name = models.CharField(max_length=200)
+    position = models.PositiveIntegerField(default=0)
+    lessons = models.JSONField(default=list, blank=True)  # Lesson titles from skills.yaml
+    # Rows outside skills.yaml (e.g. courses kept for old enrollment records) stay out of the catalog
+    in_catalog = models.BooleanField(default=False)
 
     def __str__(self):
         return f"{self.name}"
 
+    @classmethod
+    def resolve_id(cls, group_name, subgroup_name, skill_name):
+        """Return the id of the SkillName at group > subgroup > skill, or None"""
+        from .catalog import get_catalog
+        skill_id = get_catalog().skill_ids.get(f"{group_name}|{subgroup_name}|{skill_name}")
+        if skill_id is not None:
+            return skill_id
+        # Not in the loaded catalog (or the tables were never loaded)
+        return cls.objects.filter(
+            name=skill_name,
+            subgroup__name=subgroup_name,
+            subgroup__group__name=group_name
+        ).values_list('id', flat=True).first()
+
+class CatalogVersion(models.Model):
+    """Singleton stamp that load_skills bumps whenever the catalog tables change"""
+    version = models.PositiveIntegerField(default=0)
+    source_hash = models.CharField(max_length=64, blank=True)  # SHA-256 of the skills.yaml that was loaded
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Catalog v{self.version}"
+
+    @classmethod
+    def current(cls):
+        """Return the current version number, or None if the catalog was never loaded"""
+        return cls.objects.filter(pk=1).values_list('version', flat=True).first()
+
+    @classmethod
+    def bump(cls, source_hash=''):
+        """Atomically increment the version so every worker reloads the catalog"""
+        cls.objects.get_or_create(pk=1)
+        cls.objects.filter(pk=1).update(
+            version=F('version') + 1,
+            source_hash=source_hash,
+            updated_at=timezone.now()
+        )
+        return cls.current()
+
 class Skill(models.Model):
     name = models.ForeignKey(SkillName, on_delete=models.CASCADE)
     group = models.CharField(max_length=50, default="Unknown")
@@ -63,12 +151,97 @@ class Skill(models.Model):
     level = models.PositiveIntegerField(default=0)
     last_updated = models.DateTimeField(auto_now=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what was loaded so the pre_save signals can tell what changed without re-fetching
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     def save(self, *args, **kwargs):
         # Ensure level is always between 0 and 100
         self.level = min(max(self.level, 0), 100)
         super().save(*args, **kwargs)
+        self._loaded_values = {'name_id': self.name_id, 'level': self.level}
 
-class CourseEnrollmentRequest(models.Model):
+class SkillLevelEvent(models.Model):
+    """Append-only log of skill level changes, written in batches by firstapp.history"""
+    user = models.ForeignKey(AltUser, on_delete=models.CASCADE, related_name='skill_level_events')
+    # The SkillName rather than the Skill row, so history survives removing and re-adding a skill
+    skill = models.ForeignKey(SkillName, on_delete=models.CASCADE, related_name='level_events')
+    old_level = models.PositiveSmallIntegerField()
+    new_level = models.PositiveSmallIntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'skill', 'created_at'], name='skillevent_user_skill_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} {self.skill.name}: {self.old_level} -> {self.new_level}"
+
+class SkillLevelDaily(models.Model):
+    """Per-user, per-skill daily rollup of SkillLevelEvent rows for the profile progress charts"""
+    user = models.ForeignKey(AltUser, on_delete=models.CASCADE, related_name='skill_level_days')
+    skill = models.ForeignKey(SkillName, on_delete=models.CASCADE, related_name='level_days')
+    day = models.DateField()
+    open_level = models.PositiveSmallIntegerField()  # Level before the day's first change
+    close_level = models.PositiveSmallIntegerField()  # Level after the day's last change
+    change_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['day']
+        unique_together = ['user', 'skill', 'day']
+        indexes = [
+            models.Index(fields=['user', 'day'], name='skillday_user_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} {self.skill.name} {self.day}: {self.open_level} -> {self.close_level}"
+
+class CourseQuerySet(models.QuerySet):
+    def for_course(self, skill_group, skill_subgroup, skill_name):
+        """Filter on a course given by its group, subgroup and skill names"""
+        course_id = SkillName.resolve_id(skill_group, skill_subgroup, skill_name)
+        if course_id is None:
+            return self.none()
+        return self.filter(course_id=course_id)
+
+class CourseManager(models.Manager.from_queryset(CourseQuerySet)):
+    # The skill_group/skill_subgroup/skill_name accessors walk the course path,
+    # so always fetch it in the same query
+    def get_queryset(self):
+        return super().get_queryset().select_related('course__subgroup__group')
+
+class CourseRecord(models.Model):
+    """Base for models that identify a course by its SkillName"""
+    # PROTECT: removing a course from the catalog must never delete its enrollments or sessions
+    course = models.ForeignKey(SkillName, on_delete=models.PROTECT, related_name='%(class)s_set')
+
+    objects = CourseManager()
+
+    class Meta:
+        abstract = True
+
+    # Backward-compatible accessors for the former skill_group/skill_subgroup/skill_name columns
+    @property
+    def skill_group(self):
+        return self.course.subgroup.group.name
+
+    @property
+    def skill_subgroup(self):
+        return self.course.subgroup.name
+
+    @property
+    def skill_name(self):
+        return self.course.name
+
+    @property
+    def course_full_name(self):
+        return f"{self.skill_group} > {self.skill_subgroup} > {self.skill_name}"
+
+class CourseEnrollmentRequest(CourseRecord):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('approved', 'Approved'),
@@ -76,9 +249,6 @@ class CourseEnrollmentRequest(models.Model):
     ]
     
     user = models.ForeignKey(AltUser, on_delete=models.CASCADE, related_name='enrollment_requests')
-    skill_group = models.CharField(max_length=200)  # e.g., "Math"
-    skill_subgroup = models.CharField(max_length=200)  # e.g., "Practical Math"
-    skill_name = models.CharField(max_length=200)  # e.g., "Money and Shopping"
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     requested_at = models.DateTimeField(auto_now_add=True)
     reviewed_at = models.DateTimeField(null=True, blank=True)
@@ -86,27 +256,25 @@ class CourseEnrollmentRequest(models.Model):
     admin_notes = models.TextField(blank=True, null=True)
     
     class Meta:
-        unique_together = ['user', 'skill_group', 'skill_subgroup', 'skill_name']
+        unique_together = ['user', 'course']
         ordering = ['-requested_at']
+        indexes = [
+            # course_management: pending queue and recently reviewed list
+            models.Index(fields=['status', 'requested_at'], name='enroll_req_status_req_idx'),
+            models.Index(fields=['status', 'reviewed_at'], name='enroll_req_status_rev_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.skill_group}/{self.skill_subgroup}/{self.skill_name} ({self.status})"
-    
-    @property
-    def course_full_name(self):
-        return f"{self.skill_group} > {self.skill_subgroup} > {self.skill_name}"
 
-class ApprovedCourseEnrollment(models.Model):
+class ApprovedCourseEnrollment(CourseRecord):
     """Track users who have been approved and enrolled in courses"""
     user = models.ForeignKey(AltUser, on_delete=models.CASCADE, related_name='approved_enrollments')
-    skill_group = models.CharField(max_length=200)
-    skill_subgroup = models.CharField(max_length=200)
-    skill_name = models.CharField(max_length=200)
     enrollment_request = models.OneToOneField(CourseEnrollmentRequest, on_delete=models.CASCADE, related_name='approved_enrollment')
     enrolled_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        unique_together = ['user', 'skill_group', 'skill_subgroup', 'skill_name']
+        unique_together = ['user', 'course']
         ordering = ['-enrolled_at']
     
     def __str__(self):
@@ -115,19 +283,14 @@ class ApprovedCourseEnrollment(models.Model):
     @classmethod
     def get_course_count(cls, skill_group, skill_subgroup, skill_name):
         """Get the number of approved enrollments for a specific course"""
-        return cls.objects.filter(
-            skill_group=skill_group,
-            skill_subgroup=skill_subgroup,
-            skill_name=skill_name
-        ).count()
+        course_id = SkillName.resolve_id(skill_group, skill_subgroup, skill_name)
+        return CourseEnrollmentCount.get_count(course_id) if course_id else 0
     
     @classmethod
     def get_course_participants(cls, skill_group, skill_subgroup, skill_name):
         """Get all approved participants for a specific course with their enrollment details"""
-        return cls.objects.filter(
-            skill_group=skill_group,
-            skill_subgroup=skill_subgroup,
-            skill_name=skill_name
+        return cls.objects.for_course(
+            skill_group, skill_subgroup, skill_name
         ).select_related('user', 'enrollment_request').order_by('enrolled_at')
     
     @classmethod
@@ -142,8 +305,32 @@ class ApprovedCourseEnrollment(models.Model):
         current_count = cls.get_course_count(skill_group, skill_subgroup, skill_name)
         return MAX_PARTICIPANTS_PER_COURSE - current_count
 
-class ScheduledCourse(models.Model):
+class CourseEnrollmentCount(models.Model):
+    """Approved enrollments per course, maintained from ApprovedCourseEnrollment signals"""
+    course = models.OneToOneField(SkillName, on_delete=models.CASCADE, primary_key=True, related_name='enrollment_count')
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.course}: {self.count}"
+
+    @classmethod
+    def get_count(cls, course_id):
+        return cls.objects.filter(pk=course_id).values_list('count', flat=True).first() or 0
+
+    @classmethod
+    def add(cls, course_id, delta):
+        """Atomically adjust the counter, creating its row on the first increment"""
+        counter = cls.objects.filter(pk=course_id)
+        if delta < 0:
+            # Never recreate a row here: the course itself may be mid-cascade-delete
+            counter.filter(count__gte=-delta).update(count=F('count') + delta)
+            return
+        cls.objects.get_or_create(pk=course_id)
+        counter.update(count=F('count') + delta)
+
+class ScheduledCourse(CourseRecord):
     """Track scheduled courses with specific dates and times"""
+    PRIVATE_LESSON_GROUP = "Private Lesson"
     WEEKDAY_CHOICES = [
         (0, 'Monday'),
         (1, 'Tuesday'), 
@@ -154,31 +341,67 @@ class ScheduledCourse(models.Model):
         (6, 'Sunday'),
     ]
     
-    skill_group = models.CharField(max_length=200)
-    skill_subgroup = models.CharField(max_length=200)
-    skill_name = models.CharField(max_length=200)
+    # Private lessons may predate the catalog skill they were booked for
+    course = models.ForeignKey(SkillName, on_delete=models.PROTECT, null=True, blank=True, related_name='scheduled_courses')
+    is_private = models.BooleanField(default=False)
+    private_label = models.CharField(max_length=200, blank=True)  # e.g., "Student Name (beginner)"
     scheduled_date = models.DateField()
     scheduled_time = models.TimeField()
     instructor = models.ForeignKey(AltUser, on_delete=models.CASCADE, related_name='scheduled_courses')
     max_students = models.PositiveIntegerField(default=20)
     enrolled_students = models.ManyToManyField(AltUser, through='CourseAttendance', related_name='enrolled_courses')
+    enrolled_count = models.PositiveIntegerField(default=0, verbose_name='Enrolled Students')  # Maintained from CourseAttendance signals
     created_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
     
     class Meta:
         ordering = ['scheduled_date', 'scheduled_time']
-        unique_together = ['skill_group', 'skill_subgroup', 'skill_name', 'scheduled_date', 'scheduled_time']
+        unique_together = ['course', 'private_label', 'scheduled_date', 'scheduled_time']
+        constraints = [
+            # One active private lesson per slot, whoever booked it
+            models.UniqueConstraint(
+                fields=['scheduled_date', 'scheduled_time'],
+                condition=models.Q(is_private=True, is_active=True),
+                name='unique_active_private_slot',
+            ),
+        ]
+        indexes = [
+            # index week view
+            models.Index(fields=['is_active', 'scheduled_date', 'scheduled_time'], name='sched_active_date_time_idx'),
+        ]
     
     def __str__(self):
         return f"{self.skill_group}/{self.skill_subgroup}/{self.skill_name} - {self.scheduled_date} {self.scheduled_time}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded date so a reschedule can invalidate the week it moved away from
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {'scheduled_date': self.scheduled_date}
+    
+    # Private lessons keep their former shape: "Private Lesson" > skill > student
     @property
-    def course_full_name(self):
-        return f"{self.skill_group} > {self.skill_subgroup} > {self.skill_name}"
+    def skill_group(self):
+        return self.PRIVATE_LESSON_GROUP if self.is_private else super().skill_group
+    
+    @property
+    def skill_subgroup(self):
+        if self.is_private:
+            return self.course.name if self.course_id else "General Skills"
+        return super().skill_subgroup
+    
+    @property
+    def skill_name(self):
+        return self.private_label if self.is_private else super().skill_name
     
     @property
     def available_spots(self):
-        return self.max_students - self.enrolled_students.count()
+        return self.max_students - self.enrolled_count
     
     @property
     def is_full(self):
@@ -193,6 +416,10 @@ class CourseAttendance(models.Model):
     
     class Meta:
         unique_together = ['student', 'scheduled_course']
+        indexes = [
+            # Attendance per scheduled course (the unique index leads with student)
+            models.Index(fields=['scheduled_course', 'student'], name='attendance_course_student_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student.username} in {self.scheduled_course}"
\ No newline at end of file
@@ -1,6 +1,13 @@
-from django.db.models.signals import post_save, pre_save
+from django.core.signals import request_finished
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from .models import AltUser, Profile, Skill
+from .catalog import get_catalog
+from .history import flush_on_request_finished, record_level_change
+from .week_calendar import invalidate_weeks
+from .models import (
+    AltUser, ApprovedCourseEnrollment, CourseAttendance, CourseEnrollmentCount, Profile, ScheduledCourse, Skill
+)
 
 @receiver(post_save, sender=AltUser)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -11,19 +18,75 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(pre_save, sender=Skill)
 def auto_populate_skill_metadata(sender, instance, **kwargs):
     """Automatically populate group and subgroup from the SkillName relationship"""
-    if instance.name:
-        instance.group = instance.name.subgroup.group.name
-        instance.subgroup = instance.name.subgroup.name
+    if not instance.name_id:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if loaded.get('name_id') == instance.name_id:
+        # Same SkillName as when loaded, so group/subgroup are already correct
+        return
+    path = get_catalog().skill_paths.get(instance.name_id)
+    if path is None:
+        # SkillName outside the loaded catalog
+        path = (instance.name.subgroup.group.name, instance.name.subgroup.name)
+    instance.group, instance.subgroup = path[0], path[1]
 
-@receiver(pre_save, sender=Skill)
-def track_skill_changes(sender, instance, **kwargs):
-    """Track when skill levels change"""
-    if instance.pk:  # Only for existing skills being updated
-        try:
-            old_skill = Skill.objects.get(pk=instance.pk)
-            if old_skill.level != instance.level:
-                # You could add logging or history tracking here if needed
-                pass
-        except Skill.DoesNotExist:
-            # New skill, no tracking needed
-            pass
+@receiver(post_save, sender=Skill)
+def track_skill_changes(sender, instance, created, **kwargs):
+    """Queue a SkillLevelEvent when a skill's level changed"""
+    # Runs before Skill.save() refreshes _loaded_values, so it still holds the old level
+    loaded = getattr(instance, '_loaded_values', {})
+    if not created and 'level' in loaded and loaded['level'] != instance.level:
+        record_level_change(instance.user_id, instance.name_id, loaded['level'], instance.level)
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def invalidate_profile_summary(sender, instance, **kwargs):
+    AltUser.bump_skills_version(instance.user_id)
+
+# Write the history outbox once the response has been sent
+request_finished.connect(flush_on_request_finished, dispatch_uid='firstapp_flush_skill_history')
+
+@receiver(post_save, sender=CourseAttendance)
+def increment_enrolled_count(sender, instance, created, **kwargs):
+    """Keep ScheduledCourse.enrolled_count in step with new attendance rows"""
+    if created:
+        ScheduledCourse.objects.filter(pk=instance.scheduled_course_id).update(
+            enrolled_count=F('enrolled_count') + 1
+        )
+
+@receiver(post_delete, sender=CourseAttendance)
+def decrement_enrolled_count(sender, instance, **kwargs):
+    """Runs for single, queryset and admin deletes alike"""
+    ScheduledCourse.objects.filter(pk=instance.scheduled_course_id, enrolled_count__gt=0).update(
+        enrolled_count=F('enrolled_count') - 1
+    )
+
+@receiver(post_save, sender=ScheduledCourse)
+@receiver(post_delete, sender=ScheduledCourse)
+def invalidate_course_weeks(sender, instance, **kwargs):
+    """Drop the cached week grid, for both weeks when a reschedule moved the course"""
+    loaded = getattr(instance, '_loaded_values', {})
+    invalidate_weeks([instance.scheduled_date, loaded.get('scheduled_date')])
+
+@receiver(post_save, sender=CourseAttendance)
+@receiver(post_delete, sender=CourseAttendance)
+def invalidate_attendance_week(sender, instance, **kwargs):
+    """Enrolling or leaving changes the course's available spots"""
+    if CourseAttendance.scheduled_course.is_cached(instance):
+        scheduled_date = instance.scheduled_course.scheduled_date
+    else:
+        scheduled_date = ScheduledCourse.objects.filter(pk=instance.scheduled_course_id).values_list(
+            'scheduled_date', flat=True
+        ).first()
+    # None when the course itself is being deleted; its own signal covers that week
+    invalidate_weeks([scheduled_date])
+
+@receiver(post_save, sender=ApprovedCourseEnrollment)
+def increment_course_enrollment_count(sender, instance, created, **kwargs):
+    """Runs inside the caller's transaction, so the counter commits with the enrollment"""
+    if created:
+        CourseEnrollmentCount.add(instance.course_id, 1)
+
+@receiver(post_delete, sender=ApprovedCourseEnrollment)
+def decrement_course_enrollment_count(sender, instance, **kwargs):
+    CourseEnrollmentCount.add(instance.course_id, -1)
@@ -0,0 +1,81 @@
+"""
+Private lesson slot engine.
+
+Candidate slots are generated from the PRIVATE_LESSON_* settings: every
+configured weekday and start time from the current week's Monday, over
+PRIVATE_LESSON_WEEKS weeks, skipping days before today. The booked
+private sessions of the whole window are fetched in one range query and
+the free slots are the candidates that are not in that set.
+"""
+
+import datetime
+
+from django.conf import settings
+
+from .models import ScheduledCourse
+
+
+def _settings():
+    weeks = getattr(settings, 'PRIVATE_LESSON_WEEKS', 4)
+    weekdays = sorted(set(getattr(settings, 'PRIVATE_LESSON_WEEKDAYS', (0, 1, 2, 3, 4))))
+    start_times = sorted(
+        datetime.time.fromisoformat(value)
+        for value in getattr(settings, 'PRIVATE_LESSON_START_TIMES', ('19:00', '20:00'))
+    )
+    duration = datetime.timedelta(minutes=getattr(settings, 'PRIVATE_LESSON_DURATION_MINUTES', 60))
+    return weeks, weekdays, start_times, duration
+
+
+def _format_time(value):
+    return value.strftime('%I:%M %p').lstrip('0')
+
+
+def lesson_end(slot_date, start_time):
+    """End time of a private lesson starting at ``start_time``"""
+    _, _, _, duration = _settings()
+    return (datetime.datetime.combine(slot_date, start_time) + duration).time()
+
+
+def candidate_slots(today=None):
+    """Return every configured (date, time) in the booking window, in order"""
+    today = today or datetime.date.today()
+    weeks, weekdays, start_times, _ = _settings()
+    monday = today - datetime.timedelta(days=today.weekday())
+    slots = []
+    for week in range(weeks):
+        for weekday in weekdays:
+            slot_date = monday + datetime.timedelta(weeks=week, days=weekday)
+            if slot_date >= today:  # Only future dates
+                slots.extend((slot_date, start_time) for start_time in start_times)
+    return slots
+
+
+def booked_slots(start_date, end_date):
+    """Set of (date, time) taken by active private lessons between the two dates"""
+    return set(ScheduledCourse.objects.filter(
+        is_private=True,
+        is_active=True,
+        scheduled_date__range=(start_date, end_date),
+    ).values_list('scheduled_date', 'scheduled_time'))
+
+
+def available_slots(today=None):
+    """Return the free slots as dicts for the booking form"""
+    candidates = candidate_slots(today)
+    if not candidates:
+        return []
+    booked = booked_slots(candidates[0][0], candidates[-1][0])
+
+    slots = []
+    for slot_date, start_time in candidates:
+        if (slot_date, start_time) in booked:
+            continue
+        end_time = lesson_end(slot_date, start_time)
+        slots.append({
+            'date': slot_date,
+            'time': start_time,
+            'date_str': slot_date.isoformat(),
+            'time_str': start_time.isoformat(),
+            'display': f"{slot_date.strftime('%A, %B %d, %Y')} - {_format_time(start_time)} - {_format_time(end_time)}",
+        })
+    return slots
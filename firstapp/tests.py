@@ -1,3 +1,284 @@
-from django.test import TestCase
+from datetime import date, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import history, instructors, slots
+from .forms import get_skill_choices
+from .models import AltUser, ScheduledCourse, SkillGroup, SkillLevelDaily, SkillLevelEvent, SkillName, SkillSubgroup
+
+
+def make_course():
+    group = SkillGroup.objects.create(name='Math')
+    subgroup = SkillSubgroup.objects.create(group=group, name='Practical Math')
+    return SkillName.objects.create(subgroup=subgroup, name='Unlisted Course')
+
+
+# Tests render templates without running collectstatic first
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class WeekCalendarCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = AltUser.objects.create_user('teacher', 'teacher@example.com', 'pw', is_staff=True)
+        self.course = make_course()
+        self.monday = date.today() - timedelta(days=date.today().weekday())
+
+    def schedule(self, scheduled_date):
+        return ScheduledCourse.objects.create(
+            course=self.course,
+            scheduled_date=scheduled_date,
+            scheduled_time=time(10, 0),
+            instructor=self.instructor,
+        )
+
+    def test_index_serves_cached_week_until_schedule_changes(self):
+        self.schedule(self.monday)
+        url = f"{reverse('index')}?week={self.monday.isoformat()}"
+
+        first = self.client.get(url)
+        self.assertContains(first, 'Unlisted Course')
+        self.assertEqual(len(first.context['upcoming_courses']), 1)
+
+        # A cache hit never evaluates the week's courses
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertFalse([query for query in queries if 'firstapp_scheduledcourse' in query['sql']])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.schedule(self.monday + timedelta(days=1))
+        self.assertEqual(self.client.get(url).content.count(b'Unlisted Course'), 2)
+
+    def test_reschedule_invalidates_both_weeks(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            course = self.schedule(self.monday)
+        this_week = f"{reverse('index')}?week={self.monday.isoformat()}"
+        next_monday = self.monday + timedelta(days=7)
+        next_week = f"{reverse('index')}?week={next_monday.isoformat()}"
+        self.assertContains(self.client.get(this_week), 'Unlisted Course')
+        self.assertNotContains(self.client.get(next_week), 'Unlisted Course')
+
+        course = ScheduledCourse.objects.get(pk=course.pk)
+        course.scheduled_date = next_monday
+        with self.captureOnCommitCallbacks(execute=True):
+            course.save()
+
+        self.assertNotContains(self.client.get(this_week), 'Unlisted Course')
+        self.assertContains(self.client.get(next_week), 'Unlisted Course')
+
+    def test_logout_redirects_to_index(self):
+        self.client.login(username='teacher', password='pw')
+        response = self.client.get(reverse('logout'))
+        self.assertRedirects(response, reverse('index'), fetch_redirect_response=False)
+        self.assertContains(self.client.get(reverse('index')), 'You have been logged out.')
+
+
+class SkillHistoryTests(TestCase):
+    def setUp(self):
+        history._outbox.clear()
+        self.user = AltUser.objects.create_user('learner', 'learner@example.com', 'pw')
+        self.skill = make_course()
+
+    def record(self, *levels):
+        """Record the level moving through ``levels`` and commit"""
+        changes = [(self.user.id, self.skill.id, old, new) for old, new in zip(levels, levels[1:])]
+        with self.captureOnCommitCallbacks(execute=True):
+            history.record_level_changes(changes)
+
+    def test_flush_writes_events_and_daily_rollup(self):
+        self.record(10, 12, 15, 14)
+        self.assertEqual(history.flush(), 3)
+        self.assertEqual(SkillLevelEvent.objects.count(), 3)
+
+        rollup = SkillLevelDaily.objects.get()
+        self.assertEqual((rollup.open_level, rollup.close_level, rollup.change_count), (10, 14, 3))
+        self.assertEqual(rollup.day, date.today())
+
+        # A later flush recomputes the same day's row from all of its events
+        self.record(14, 20)
+        history.flush()
+        rollup = SkillLevelDaily.objects.get()
+        self.assertEqual((rollup.open_level, rollup.close_level, rollup.change_count), (10, 20, 4))
+
+    def test_rolled_back_changes_are_not_recorded(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            history.record_level_change(self.user.id, self.skill.id, 1, 2)
+        self.assertEqual(history.flush(), 0)
+        self.assertFalse(SkillLevelEvent.objects.exists())
+
+    def test_failed_flush_keeps_a_capped_outbox_without_raising(self):
+        self.record(1, 2, 3, 4)
+        with mock.patch.object(history, 'OUTBOX_MAX', 2), \
+                mock.patch.object(SkillLevelEvent.objects, 'bulk_create', side_effect=DatabaseError), \
+                self.assertLogs('firstapp.history', 'ERROR'):
+            self.assertEqual(history.flush(), 0)
+        self.assertEqual([event.new_level for event in history._outbox], [3, 4])
+
+        self.assertEqual(history.flush(), 2)
+        self.assertEqual(SkillLevelEvent.objects.count(), 2)
+
+
+class UpdateSkillLevelsTests(TestCase):
+    def setUp(self):
+        AltUser.objects.create_user('learner', 'learner@example.com', 'pw')
+        self.client.login(username='learner', password='pw')
+
+    def post(self, body):
+        return self.client.post(reverse('update_skill_levels'), body, content_type='application/json')
+
+    def test_rejects_json_that_is_not_an_object(self):
+        for body in ('[]', '"changes"', '1', 'null'):
+            with self.subTest(body=body):
+                self.assertEqual(self.post(body).json(), {'success': False, 'error': 'Invalid changes'})
+
+    def test_rejects_malformed_changes(self):
+        for change in (
+            '"skill"',
+            '{"skill_id": 1, "delta": 1e400}',
+            '{"skill_id": 1, "delta": Infinity}',
+            '{"skill_id": 1, "level": -Infinity}',
+            '{"skill_id": 1, "level": NaN}',
+            '{"skill_id": 1000000000000000000000000000000, "delta": 1}',
+            '{"skill_id": 0, "delta": 1}',
+        ):
+            with self.subTest(change=change):
+                response = self.post(f'{{"changes": [{change}]}}')
+                self.assertEqual(response.json(), {'success': False, 'error': 'Invalid changes'})
+
+
+@override_settings(PRIVATE_LESSON_WEEKS=1, PRIVATE_LESSON_WEEKDAYS=(0, 2), PRIVATE_LESSON_START_TIMES=('20:00', '19:00'))
+class AvailableSlotsTests(TestCase):
+    monday = date(2026, 10, 19)
+
+    def setUp(self):
+        self.instructor = AltUser.objects.create_user('teacher', 'teacher@example.com', 'pw', is_staff=True)
+
+    def book(self, scheduled_date, scheduled_time, is_private=True, is_active=True):
+        ScheduledCourse.objects.create(
+            scheduled_date=scheduled_date,
+            scheduled_time=scheduled_time,
+            instructor=self.instructor,
+            is_private=is_private,
+            is_active=is_active,
+        )
+
+    def test_booked_private_slots_are_excluded(self):
+        wednesday = self.monday + timedelta(days=2)
+        self.book(self.monday, time(19, 0))
+        self.book(wednesday, time(19, 0), is_private=False)
+        self.book(wednesday, time(20, 0), is_active=False)
+
+        free = [(slot['date'], slot['time']) for slot in slots.available_slots(today=self.monday)]
+        self.assertEqual(free, [
+            (self.monday, time(20, 0)),
+            (wednesday, time(19, 0)),
+            (wednesday, time(20, 0)),
+        ])
+
+    def test_slot_display_values(self):
+        slot = slots.available_slots(today=self.monday)[0]
+        self.assertEqual((slot['date_str'], slot['time_str']), ('2026-10-19', '19:00:00'))
+        self.assertEqual(slot['display'], 'Monday, October 19, 2026 - 7:00 PM - 8:00 PM')
+
+    @override_settings(PRIVATE_LESSON_DURATION_MINUTES=45)
+    def test_lesson_length_follows_the_setting(self):
+        self.assertEqual(slots.lesson_end(self.monday, time(19, 0)), time(19, 45))
+        slot = slots.available_slots(today=self.monday)[0]
+        self.assertEqual(slot['display'], 'Monday, October 19, 2026 - 7:00 PM - 7:45 PM')
+
+    def test_days_before_today_are_skipped(self):
+        wednesday = self.monday + timedelta(days=2)
+        self.assertEqual({slot['date'] for slot in slots.available_slots(today=wednesday)}, {wednesday})
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class PrivateLessonBookingTests(TestCase):
+    def setUp(self):
+        AltUser.objects.create_user('teacher', 'teacher@example.com', 'pw', is_staff=True)
+        self.slot = slots.available_slots()[0]
+
+    def book(self):
+        return self.client.post(reverse('private_lesson'), {
+            'skill': get_skill_choices()[0][0],
+            'student_name': 'Sam',
+            'experience_level': 'beginner',
+            'parent_name': 'Alex',
+            'contact_email': 'alex@example.com',
+            'time_slot': f"{self.slot['date_str']}|{self.slot['time_str']}",
+        })
+
+    @override_settings(PRIVATE_LESSON_DURATION_MINUTES=90)
+    def test_confirmation_shows_the_lesson_end_time(self):
+        response = self.book()
+        [message] = get_messages(response.wsgi_request)
+        self.assertIn("from 07:00 PM to 08:30 PM.", str(message))
+
+    def test_second_booking_of_a_slot_conflicts(self):
+        self.assertRedirects(self.book(), reverse('private_lesson'), fetch_redirect_response=False)
+        response = self.book()
+        self.assertContains(response, 'That time slot has just been taken.', status_code=409)
+        self.assertNotIn(self.slot, response.context['available_slots'])
+        self.assertEqual(ScheduledCourse.objects.filter(is_private=True).count(), 1)
+
+    def test_losing_the_race_at_insert_conflicts(self):
+        AltUser.objects.create_user('second', 'second@example.com', 'pw', is_staff=True)
+        self.book()
+        # Both requests saw the slot as free; the unique constraint picks the winner
+        with mock.patch.object(slots, 'available_slots', return_value=[self.slot]):
+            response = self.book()
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(ScheduledCourse.objects.filter(is_private=True).count(), 1)
+
+    def test_busy_instructors_are_skipped(self):
+        teacher = AltUser.objects.get(username='teacher')
+        second = AltUser.objects.create_user('second', 'second@example.com', 'pw', is_staff=True)
+        def teach(instructor):
+            ScheduledCourse.objects.create(
+                scheduled_date=self.slot['date'], scheduled_time=self.slot['time'], instructor=instructor,
+            )
+
+        teach(teacher)
+        self.assertEqual(instructors.pick_instructor(self.slot['date'], self.slot['time']), second.id)
+
+        teach(second)
+        self.assertIsNone(instructors.pick_instructor(self.slot['date'], self.slot['time']))
+        self.assertContains(self.book(), 'That time slot has just been taken.', status_code=409)
+        self.assertFalse(ScheduledCourse.objects.filter(is_private=True).exists())
+
+
+class RescheduleCourseTests(TestCase):
+    def setUp(self):
+        self.instructor = AltUser.objects.create_user('teacher', 'teacher@example.com', 'pw', is_staff=True)
+        self.client.login(username='teacher', password='pw')
+        self.day = date.today() + timedelta(days=1)
+
+    def private_lesson(self, label, scheduled_time):
+        return ScheduledCourse.objects.create(
+            is_private=True, private_label=label, scheduled_date=self.day,
+            scheduled_time=scheduled_time, instructor=self.instructor,
+        )
+
+    def reschedule(self, lesson, scheduled_time):
+        return self.client.post(
+            reverse('reschedule_course', args=[lesson.id]),
+            {'date': self.day.isoformat(), 'time': scheduled_time},
+            content_type='application/json',
+        ).json()
+
+    def test_private_lesson_cannot_move_onto_a_taken_slot(self):
+        self.private_lesson('Sam (beginner)', time(19, 0))
+        lesson = self.private_lesson('Kim (advanced)', time(20, 0))
+        taken = {'success': False, 'error': 'That time slot is already taken by another private lesson'}
+
+        self.assertEqual(self.reschedule(lesson, '19:00'), taken)
+        # A booking that commits after the check still loses at the constraint
+        with mock.patch.object(ScheduledCourse.objects, 'filter', return_value=ScheduledCourse.objects.none()):
+            self.assertEqual(self.reschedule(lesson, '19:00'), taken)
+        lesson.refresh_from_db()
+        self.assertEqual(lesson.scheduled_time, time(20, 0))
+
+        self.assertTrue(self.reschedule(lesson, '21:00')['success'])
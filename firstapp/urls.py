@@ -9,10 +9,12 @@ urlpatterns = [
     path('profile_edit/', views.profile_edit, name='profile_edit'),
     path('logout/', views.logout, name='logout'),
     path('update_skill/<int:skill_id>/', views.update_skill, name='update_skill'),
+    path('api/update-skill-levels/', views.update_skill_levels, name='update_skill_levels'),
     path('delete_skill/<int:skill_id>/', views.delete_skill, name='delete_skill'),
     path('add_skill', views.add_skill, name='add_skill'),
     path('lessons/<path:group_name>/<path:subgroup_name>/<path:skill_name>/', views.lessons, name='lessons'),
     path('private-lesson/', views.private_lesson, name='private_lesson'),
+    path('api/search-catalog/', views.search_catalog, name='search_catalog'),
     
     # Course management URLs
     path('course-management/', views.course_management, name='course_management'),
@@ -4,27 +4,22 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import JsonResponse, Http404
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from django.views.decorators.http import require_http_methods
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest, Least
 from .models import Skill, SkillName, CourseEnrollmentRequest, ApprovedCourseEnrollment, ScheduledCourse, CourseAttendance, MAX_PARTICIPANTS_PER_COURSE
 from .forms import SkillForm, ProfileForm
-import yaml
-import os
+from .catalog import get_catalog
+from .history import PROGRESS_DAYS, progress_for_user, record_level_change, record_level_changes
+from . import instructors, slots, week_calendar
 import json
-from django.conf import settings
 
 User = get_user_model()
 
-def load_skills_yaml():
-    """Load skills data from YAML file"""
-    yaml_path = os.path.join(settings.BASE_DIR, 'firstapp', 'skills.yaml')
-    try:
-        with open(yaml_path, 'r') as file:
-            return yaml.safe_load(file)
-    except FileNotFoundError:
-        return []
-
 def index(request):
     """Display main page with upcoming scheduled courses"""
     from datetime import date, timedelta
@@ -44,28 +39,18 @@ def index(request):
     week_start = current_date - timedelta(days=days_since_monday)
     week_end = week_start + timedelta(days=6)
     
-    # Get scheduled courses for the selected week
-    upcoming_courses = ScheduledCourse.objects.filter(
-        scheduled_date__gte=week_start,
-        scheduled_date__lte=week_end,
-        is_active=True
-    ).order_by('scheduled_date', 'scheduled_time')
-    
-    # Group courses by date for better display
-    courses_by_date = {}
-    for course in upcoming_courses:
-        date_str = course.scheduled_date.strftime('%Y-%m-%d')
-        if date_str not in courses_by_date:
-            courses_by_date[date_str] = []
-        courses_by_date[date_str].append(course)
+    # The week's courses are only loaded when index.html misses its cached week grid
+    week_courses = SimpleLazyObject(lambda: _load_week_courses(week_start, week_end))
     
     # Calculate navigation dates
     prev_week = week_start - timedelta(days=7)
     next_week = week_start + timedelta(days=7)
     
     return render(request, 'index.html', {
-        'upcoming_courses': upcoming_courses,
-        'courses_by_date': courses_by_date,
+        'upcoming_courses': SimpleLazyObject(lambda: week_courses[0]),
+        'courses_by_date': SimpleLazyObject(lambda: week_courses[1]),
+        'calendar_week': week_calendar.iso_week(week_start),
+        'calendar_variant': week_calendar.variant_for(request.user),
         'week_start': week_start,
         'week_end': week_end,
         'current_date': current_date,
@@ -74,9 +59,26 @@ def index(request):
         'selected_week': week_start.strftime('%Y-%m-%d'),
     })
 
+def _load_week_courses(week_start, week_end):
+    """Return (courses, courses by date) for the week in one query
+
+    The course path and instructor are joined, and available_spots reads
+    the denormalized enrolled_count.
+    """
+    upcoming_courses = []
+    courses_by_date = {}
+    for course in ScheduledCourse.objects.filter(
+        scheduled_date__gte=week_start,
+        scheduled_date__lte=week_end,
+        is_active=True
+    ).select_related('instructor').order_by('scheduled_date', 'scheduled_time'):
+        upcoming_courses.append(course)
+        # Group courses by date for better display
+        courses_by_date.setdefault(course.scheduled_date.strftime('%Y-%m-%d'), []).append(course)
+    return upcoming_courses, courses_by_date
+
 def lessons(request, group_name, subgroup_name, skill_name):
     """Display lessons for a specific skill"""
-    from .forms import get_skill_lessons
     from urllib.parse import unquote
     
     # URL decode the parameters
@@ -84,72 +86,52 @@ def lessons(request, group_name, subgroup_name, skill_name):
     subgroup_name = unquote(subgroup_name)
     skill_name = unquote(skill_name)
     
-    # Get lessons from YAML
-    lessons_list = get_skill_lessons(group_name, subgroup_name, skill_name)
+    # Look the course up in the catalog index
+    entry = get_catalog().get_skill(group_name, subgroup_name, skill_name)
+    if entry is None:
+        raise Http404("Course not found")
     
     context = {
         'group_name': group_name,
         'subgroup_name': subgroup_name,
         'skill_name': skill_name,
-        'lessons': lessons_list,
+        'lessons': entry.lessons,
     }
     
     return render(request, 'lessons.html', context)
 
+def search_catalog(request):
+    """Search groups, subgroups, skills and lesson titles in the catalog"""
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 20)), 100))
+    except ValueError:
+        limit = 20
+    
+    results = get_catalog().search_index.search(query, limit)
+    
+    return JsonResponse({
+        'success': True,
+        'query': query,
+        'results': results
+    })
+
+def _private_slot_taken(request, form):
+    """Re-render the booking form with fresh slots after losing a slot"""
+    messages.error(request, "That time slot has just been taken. Please choose another one.")
+    return render(request, 'private_lesson.html', {
+        'form': form,
+        'available_slots': slots.available_slots()
+    }, status=409)
+
 def private_lesson(request):
     """Handle private lesson booking requests"""
     from .forms import PrivateLessonForm
-    from datetime import datetime, date, timedelta, time
+    from datetime import date, time
     import json
     
-    # Generate available time slots for the next 4 weeks (weekdays 7-8PM and 8-9PM)
-    available_slots = []
-    today = date.today()
-    
-    for week in range(4):  # Next 4 weeks
-        week_start = today + timedelta(weeks=week)
-        # Find Monday of this week
-        days_since_monday = week_start.weekday()
-        monday = week_start - timedelta(days=days_since_monday)
-        
-        for day in range(5):  # Monday to Friday (0-4)
-            slot_date = monday + timedelta(days=day)
-            if slot_date >= today:  # Only future dates
-                # Check if slots are already booked
-                time_7pm = time(19, 0)  # 7:00 PM
-                time_8pm = time(20, 0)  # 8:00 PM
-                
-                slot_7pm_available = not ScheduledCourse.objects.filter(
-                    skill_group="Private Lesson",
-                    scheduled_date=slot_date,
-                    scheduled_time=time_7pm,
-                    is_active=True
-                ).exists()
-                
-                slot_8pm_available = not ScheduledCourse.objects.filter(
-                    skill_group="Private Lesson", 
-                    scheduled_date=slot_date,
-                    scheduled_time=time_8pm,
-                    is_active=True
-                ).exists()
-                
-                if slot_7pm_available:
-                    available_slots.append({
-                        'date': slot_date,
-                        'time': time_7pm,
-                        'date_str': slot_date.isoformat(),
-                        'time_str': time_7pm.isoformat(),
-                        'display': f"{slot_date.strftime('%A, %B %d, %Y')} - 7:00 PM - 8:00 PM"
-                    })
-                
-                if slot_8pm_available:
-                    available_slots.append({
-                        'date': slot_date,
-                        'time': time_8pm,
-                        'date_str': slot_date.isoformat(),
-                        'time_str': time_8pm.isoformat(),
-                        'display': f"{slot_date.strftime('%A, %B %d, %Y')} - 8:00 PM - 9:00 PM"
-                    })
+    # Free slots in the booking window, from one query over the booked private lessons
+    available_slots = slots.available_slots()
     
     if request.method == 'POST':
         form = PrivateLessonForm(request.POST)
@@ -181,50 +163,58 @@ def private_lesson(request):
                 
                 print(f"DEBUG: Parsed date: {slot_date}, time: {slot_time}")
                 
+                if (slot_date, slot_time) not in {(slot['date'], slot['time']) for slot in available_slots}:
+                    return _private_slot_taken(request, form)
+                
                 selected_skill = form.cleaned_data['skill']
                 skill_display = selected_skill.split('|')[-1] if selected_skill else "General Skills"
+                course_id = SkillName.resolve_id(*selected_skill.split('|')) if selected_skill else None
                 
-                # Create instructor user (you might want to assign a specific instructor)
-                instructor = request.user if request.user.is_authenticated and request.user.is_staff else None
-                if not instructor:
-                    # Get a default instructor or create one
-                    from django.contrib.auth import get_user_model
-                    User = get_user_model()
-                    instructor = User.objects.filter(is_staff=True).first()
-                    if not instructor:
+                # Staff book for themselves; everyone else gets the least-loaded free instructor
+                instructor_id = request.user.id if request.user.is_authenticated and request.user.is_staff else None
+                if not instructor_id:
+                    instructor_id = instructors.pick_instructor(slot_date, slot_time)
+                    if not instructor_id and User.objects.filter(is_staff=True, is_active=True).exists():
+                        # Every instructor already teaches in this slot
+                        return _private_slot_taken(request, form)
+                    if not instructor_id:
                         # Create a default private lesson instructor
-                        instructor = User.objects.create_user(
+                        instructor_id = User.objects.create_user(
                             username='private_instructor',
                             email='instructor@alt-project.com',
                             first_name='Private',
                             last_name='Instructor',
                             is_staff=True
-                        )
-                
-                # Create the scheduled private lesson
-                scheduled_lesson = ScheduledCourse.objects.create(
-                    skill_group="Private Lesson",
-                    skill_subgroup=skill_display,
-                    skill_name=f"{student_name} ({experience_level})",
-                    scheduled_date=slot_date,
-                    scheduled_time=slot_time,
-                    instructor=instructor,
-                    max_students=1,  # Private lesson = 1 student max
-                    is_active=True
-                )
+                        ).id
                 
-                # If user is authenticated, enroll them automatically
-                if request.user.is_authenticated:
-                    from .models import CourseAttendance
-                    CourseAttendance.objects.create(
-                        student=request.user,
-                        scheduled_course=scheduled_lesson
-                    )
+                # Create the scheduled private lesson. The unique_active_private_slot constraint
+                # makes the database pick a single winner when several parents submit the same slot.
+                try:
+                    with transaction.atomic():
+                        scheduled_lesson = ScheduledCourse.objects.create(
+                            course_id=course_id,
+                            is_private=True,
+                            private_label=f"{student_name} ({experience_level})",
+                            scheduled_date=slot_date,
+                            scheduled_time=slot_time,
+                            instructor_id=instructor_id,
+                            max_students=1,  # Private lesson = 1 student max
+                            is_active=True
+                        )
+                        
+                        # If user is authenticated, enroll them automatically
+                        if request.user.is_authenticated:
+                            CourseAttendance.objects.create(
+                                student=request.user,
+                                scheduled_course=scheduled_lesson
+                            )
+                except IntegrityError:
+                    return _private_slot_taken(request, form)
                 
                 messages.success(request, 
                     f"Thank you {parent_name}! Your private lesson for {student_name} "
                     f"in {skill_display} has been scheduled for {slot_date.strftime('%A, %B %d, %Y')} "
-                    f"from {slot_time.strftime('%I:%M %p')} to {(datetime.combine(slot_date, slot_time) + timedelta(hours=1)).strftime('%I:%M %p')}. "
+                    f"from {slot_time.strftime('%I:%M %p')} to {slots.lesson_end(slot_date, slot_time).strftime('%I:%M %p')}. "
                     f"We'll contact you at {contact_email} with additional details.")
                 
                 # Redirect to avoid re-submission on refresh
@@ -302,7 +292,7 @@ def login(request):
 def logout(request):
     atuh_logout(request)
     messages.success(request, "You have been logged out.")
-    return render(request, "index.html")
+    return redirect("index")
 
 @login_required
 def profile_edit(request):
@@ -319,31 +309,26 @@ def profile_edit(request):
 @login_required
 def profile(request):
     user = request.user
-    user_skills = user.skill.all().select_related('name__subgroup__group')
+    summary = user.get_profile_summary()
+    organized_skills = summary['skills']
     
-    # Organize skills by group and subgroup for better display
-    organized_skills = {}
-    for skill in user_skills:
-        group = skill.group
-        subgroup = skill.subgroup
-        
-        if group not in organized_skills:
-            organized_skills[group] = {}
-        if subgroup not in organized_skills[group]:
-            organized_skills[group][subgroup] = []
-        
-        organized_skills[group][subgroup].append(skill)
+    # Attach the last days of progress, read from the daily rollups
+    progress = progress_for_user(user)
+    for subgroups in organized_skills.values():
+        for skills in subgroups.values():
+            for skill in skills:
+                skill.progress = progress.get(skill.name_id)
     
-    # Check if user has completed courses (for now, we'll use a simple check)
-    # You can modify this logic based on your course completion tracking
-    completed_courses = user_skills.filter(level__gte=80).count()  # Skills with 80+ level considered completed
+    # Skills with 80+ level considered completed
+    completed_courses = summary['completed']
     can_modify_skills = completed_courses > 0
     
     return render(request, 'profile.html', {
         'organized_skills': organized_skills,
-        'user_skills': user_skills,
+        'total_skills': summary['total'],
         'can_modify_skills': can_modify_skills,
         'completed_courses': completed_courses,
+        'progress_days': PROGRESS_DAYS,
         'profile': user.profile if hasattr(user, 'profile') else None
     })
 
@@ -353,19 +338,94 @@ def update_skill(request, skill_id):
         action = request.POST.get("action")
         
         # Get the skill by ID instead of name to avoid conflicts
-        skill = get_object_or_404(Skill, id=skill_id, user=request.user)
-        
-        # Increment or decrement
-        if action == "increment":
-            skill.level = min(skill.level + 1, 100)
-        elif action == "decrement":
-            skill.level = max(skill.level - 1, 0)
+        skills = Skill.objects.filter(id=skill_id, user=request.user)
+        
+        # Increment or decrement in a single clamped UPDATE, so rapid clicks never lose a step
+        delta = {"increment": 1, "decrement": -1}.get(action)
+        if delta is not None:
+            with transaction.atomic():
+                # Skip rows already at the bound, so a matched row always moved by exactly delta
+                moved = skills.filter(level__lt=100) if delta > 0 else skills.filter(level__gt=0)
+                updated = moved.update(
+                    level=Least(Greatest(F('level') + delta, 0), 100),
+                    last_updated=timezone.now(),
+                )
+                skill = skills.select_related('name').first()
+                if skill is None:
+                    raise Http404("No Skill matches the given query.")
+                if updated:
+                    record_level_change(request.user.id, skill.name_id, skill.level - delta, skill.level)
+                    User.bump_skills_version(request.user.id)
+        else:
+            skill = get_object_or_404(Skill.objects.select_related('name'), id=skill_id, user=request.user)
         
-        skill.save()
         messages.success(request, f"Updated {skill.name.name} level to {skill.level}")
     
     return redirect("profile")
 
+@login_required
+@require_http_methods(["POST"])
+def update_skill_levels(request):
+    """Apply several level changes at once
+
+    Expects {"changes": [{"skill_id": 1, "delta": 2}, {"skill_id": 3, "level": 40}, ...]}.
+    Changes to the same skill apply in order; levels are clamped to 0-100.
+    """
+    try:
+        data = json.loads(request.body)
+        if not isinstance(data, dict):
+            return JsonResponse({'success': False, 'error': 'Invalid changes'})
+        changes = data.get('changes')
+        if not isinstance(changes, list) or not changes:
+            return JsonResponse({'success': False, 'error': 'No changes given'})
+        
+        # int() raises OverflowError for infinite and ValueError for NaN deltas and levels
+        _, max_id = connection.ops.integer_field_range(Skill._meta.pk.get_internal_type())
+        parsed = []
+        for change in changes:
+            skill_id = int(change['skill_id'])
+            if not 0 < skill_id <= max_id:
+                raise ValueError(f"Skill id out of range: {skill_id}")
+            if 'level' in change:
+                parsed.append((skill_id, None, int(change['level'])))
+            else:
+                parsed.append((skill_id, int(change['delta']), None))
+    except (ValueError, TypeError, KeyError, OverflowError):
+        return JsonResponse({'success': False, 'error': 'Invalid changes'})
+    
+    with transaction.atomic():
+        skills = {
+            skill.id: skill
+            for skill in Skill.objects.select_for_update().filter(
+                user=request.user, id__in={skill_id for skill_id, _, _ in parsed}
+            )
+        }
+        missing = sorted({skill_id for skill_id, _, _ in parsed} - skills.keys())
+        if missing:
+            return JsonResponse({'success': False, 'error': f'Skills not found: {missing}'})
+        
+        old_levels = {skill_id: skill.level for skill_id, skill in skills.items()}
+        for skill_id, delta, level in parsed:
+            skill = skills[skill_id]
+            target = skill.level + delta if level is None else level
+            skill.level = min(max(target, 0), 100)
+        
+        changed = [skill for skill in skills.values() if skill.level != old_levels[skill.id]]
+        now = timezone.now()
+        for skill in changed:
+            skill.last_updated = now
+        Skill.objects.bulk_update(changed, ['level', 'last_updated'])
+        if changed:
+            User.bump_skills_version(request.user.id)
+        record_level_changes(
+            (request.user.id, skill.name_id, old_levels[skill.id], skill.level) for skill in changed
+        )
+    
+    return JsonResponse({
+        'success': True,
+        'skills': [{'id': skill.id, 'level': skill.level} for skill in skills.values()],
+    })
+
 @login_required
 def delete_skill(request, skill_id):
     if request.method == "POST":
@@ -392,27 +452,24 @@ def add_skill(request):
                 messages.error(request, "Invalid skill selection.")
                 return render(request, 'add_skill.html', {'form': form})
             
-            # Get or create the required database objects
-            from .models import SkillGroup, SkillSubgroup, SkillName
-            
-            # Get or create SkillGroup
-            skill_group, created = SkillGroup.objects.get_or_create(name=group)
-            
-            # Get or create SkillSubgroup
-            skill_subgroup, created = SkillSubgroup.objects.get_or_create(
-                group=skill_group,
-                name=subgroup
-            )
-            
-            # Get or create SkillName
-            skill_name_obj, created = SkillName.objects.get_or_create(
-                subgroup=skill_subgroup,
-                name=skill_name
-            )
+            # Resolve the SkillName from the catalog's id map, without touching the database
+            skill_name_id = get_catalog().skill_ids.get(skill_key)
+            if skill_name_id is None:
+                # Skill tables not loaded yet, so create the rows
+                from .models import SkillGroup, SkillSubgroup
+                skill_group, created = SkillGroup.objects.get_or_create(name=group)
+                skill_subgroup, created = SkillSubgroup.objects.get_or_create(
+                    group=skill_group,
+                    name=subgroup
+                )
+                skill_name_id = SkillName.objects.get_or_create(
+                    subgroup=skill_subgroup,
+                    name=skill_name
+                )[0].id
             
             # Create the user's skill
-            skill = Skill.objects.create(
-                name=skill_name_obj,
+            Skill.objects.create(
+                name_id=skill_name_id,
                 group=group,
                 subgroup=subgroup,
                 user=request.user,
@@ -432,7 +489,7 @@ def add_skill(request):
 def course_management(request):
     """Admin view to manage course enrollment requests"""
     # Get all pending requests
-    pending_requests = CourseEnrollmentRequest.objects.filter(status='pending').order_by('-requested_at')
+    pending_requests = CourseEnrollmentRequest.objects.filter(status='pending').select_related('user').order_by('-requested_at')
     
     # Get recent approved/rejected requests for reference
     recent_reviewed = CourseEnrollmentRequest.objects.filter(
@@ -441,7 +498,7 @@ def course_management(request):
     
     # Get users who are already enrolled in scheduled courses to exclude their requests
     enrolled_users = CourseAttendance.objects.all().values_list(
-        'student_id', 'scheduled_course__skill_group', 'scheduled_course__skill_subgroup', 'scheduled_course__skill_name'
+        'student_id', 'scheduled_course__course_id'
     )
     enrolled_user_courses = set(enrolled_users)
     
@@ -450,12 +507,7 @@ def course_management(request):
     
     # Add pending requests to schedule courses (exclude users already enrolled in sessions)
     for enrollment_request in pending_requests:
-        user_course_key = (
-            enrollment_request.user.id, 
-            enrollment_request.skill_group, 
-            enrollment_request.skill_subgroup, 
-            enrollment_request.skill_name
-        )
+        user_course_key = (enrollment_request.user_id, enrollment_request.course_id)
         if user_course_key not in enrolled_user_courses:
             schedule_courses_data.append({
                 'type': 'pending',
@@ -492,8 +544,8 @@ def course_management(request):
                 'instructor': course.instructor,
                 'max_students': course.max_students,
                 'participants': participants,
-                'enrolled_count': participants.count(),
-                'available_spots': course.max_students - participants.count()
+                'enrolled_count': course.enrolled_count,
+                'available_spots': course.available_spots
             })
     
     # Get statistics
@@ -572,12 +624,14 @@ def request_course_enrollment(request):
         if not all([skill_group, skill_subgroup, skill_name]):
             return JsonResponse({'success': False, 'error': 'Missing required parameters'})
         
+        course_id = SkillName.resolve_id(skill_group, skill_subgroup, skill_name)
+        if course_id is None:
+            return JsonResponse({'success': False, 'error': 'Course not found'})
+        
         # Check if user already has a request for this course
         existing_request = CourseEnrollmentRequest.objects.filter(
             user=request.user,
-            skill_group=skill_group,
-            skill_subgroup=skill_subgroup,
-            skill_name=skill_name
+            course_id=course_id
         ).first()
         
         if existing_request:
@@ -608,9 +662,7 @@ def request_course_enrollment(request):
             # Create new request
             CourseEnrollmentRequest.objects.create(
                 user=request.user,
-                skill_group=skill_group,
-                skill_subgroup=skill_subgroup,
-                skill_name=skill_name
+                course_id=course_id
             )
         
         return JsonResponse({
@@ -631,12 +683,14 @@ def check_course_enrollment_status(request):
     if not all([skill_group, skill_subgroup, skill_name]):
         return JsonResponse({'enrolled': False, 'status': 'missing_params'})
     
+    course_id = SkillName.resolve_id(skill_group, skill_subgroup, skill_name)
+    if course_id is None:
+        return JsonResponse({'enrolled': False, 'status': 'not_requested'})
+    
     # Check if approved enrollment exists
     enrollment = ApprovedCourseEnrollment.objects.filter(
         user=request.user,
-        skill_group=skill_group,
-        skill_subgroup=skill_subgroup,
-        skill_name=skill_name
+        course_id=course_id
     ).first()
     
     if enrollment:
@@ -645,9 +699,7 @@ def check_course_enrollment_status(request):
     # Check if there's a pending request
     pending_request = CourseEnrollmentRequest.objects.filter(
         user=request.user,
-        skill_group=skill_group,
-        skill_subgroup=skill_subgroup,
-        skill_name=skill_name,
+        course_id=course_id,
         status='pending'
     ).first()
     
@@ -657,9 +709,7 @@ def check_course_enrollment_status(request):
     # Check if there's a rejected request
     rejected_request = CourseEnrollmentRequest.objects.filter(
         user=request.user,
-        skill_group=skill_group,
-        skill_subgroup=skill_subgroup,
-        skill_name=skill_name,
+        course_id=course_id,
         status='rejected'
     ).first()
     
@@ -684,6 +734,7 @@ def debug_enrollment(request):
 
 @staff_member_required
 @require_http_methods(["POST"])
+@transaction.atomic
 def schedule_course(request):
     """Schedule a specific enrollment request for a specific date and time"""
     try:
@@ -699,11 +750,14 @@ def schedule_course(request):
         if not all([skill_group, skill_subgroup, skill_name, request_id, scheduled_date, scheduled_time]):
             return JsonResponse({'success': False, 'error': 'Missing required parameters'})
         
+        course_id = SkillName.resolve_id(skill_group, skill_subgroup, skill_name)
+        if course_id is None:
+            return JsonResponse({'success': False, 'error': 'Course not found'})
+        
         # Check if this course is already scheduled for this date/time
         existing_schedule = ScheduledCourse.objects.filter(
-            skill_group=skill_group,
-            skill_subgroup=skill_subgroup,
-            skill_name=skill_name,
+            course_id=course_id,
+            is_private=False,
             scheduled_date=scheduled_date,
             scheduled_time=scheduled_time
         ).first()
@@ -716,9 +770,7 @@ def schedule_course(request):
         
         # Create the scheduled course
         scheduled_course = ScheduledCourse.objects.create(
-            skill_group=skill_group,
-            skill_subgroup=skill_subgroup,
-            skill_name=skill_name,
+            course_id=course_id,
             scheduled_date=scheduled_date,
             scheduled_time=scheduled_time,
             instructor=request.user,
@@ -729,9 +781,7 @@ def schedule_course(request):
         try:
             participant_request = CourseEnrollmentRequest.objects.get(
                 id=request_id,
-                skill_group=skill_group,
-                skill_subgroup=skill_subgroup,
-                skill_name=skill_name,
+                course_id=course_id,
                 status='pending'
             )
         except CourseEnrollmentRequest.DoesNotExist:
@@ -740,9 +790,8 @@ def schedule_course(request):
         # Check if this participant is already enrolled in ANY session for this course
         existing_enrollment = CourseAttendance.objects.filter(
             student=participant_request.user,
-            scheduled_course__skill_group=skill_group,
-            scheduled_course__skill_subgroup=skill_subgroup,
-            scheduled_course__skill_name=skill_name
+            scheduled_course__course_id=course_id,
+            scheduled_course__is_private=False
         ).exists()
         
         if existing_enrollment:
@@ -759,9 +808,7 @@ def schedule_course(request):
         # Create the approved enrollment record
         ApprovedCourseEnrollment.objects.create(
             user=participant_request.user,
-            skill_group=skill_group,
-            skill_subgroup=skill_subgroup,
-            skill_name=skill_name,
+            course_id=course_id,
             enrollment_request=participant_request
         )
         
@@ -797,9 +844,8 @@ def reschedule_course(request, course_id):
         
         # Check if there's already a course scheduled for this date/time with the same skill
         existing_schedule = ScheduledCourse.objects.filter(
-            skill_group=scheduled_course.skill_group,
-            skill_subgroup=scheduled_course.skill_subgroup,
-            skill_name=scheduled_course.skill_name,
+            course_id=scheduled_course.course_id,
+            private_label=scheduled_course.private_label,
             scheduled_date=new_date,
             scheduled_time=new_time
         ).exclude(id=course_id).first()
@@ -810,6 +856,16 @@ def reschedule_course(request, course_id):
                 'error': 'This course is already scheduled for this date and time'
             })
         
+        # Only one active private lesson per slot (unique_active_private_slot)
+        slot_taken = {'success': False, 'error': 'That time slot is already taken by another private lesson'}
+        if scheduled_course.is_private and scheduled_course.is_active and ScheduledCourse.objects.filter(
+            is_private=True,
+            is_active=True,
+            scheduled_date=new_date,
+            scheduled_time=new_time
+        ).exclude(id=course_id).exists():
+            return JsonResponse(slot_taken)
+        
         # Store old schedule for the message
         old_date = scheduled_course.scheduled_date
         old_time = scheduled_course.scheduled_time
@@ -817,7 +873,11 @@ def reschedule_course(request, course_id):
         # Update the scheduled course
         scheduled_course.scheduled_date = new_date
         scheduled_course.scheduled_time = new_time
-        scheduled_course.save()
+        try:
+            with transaction.atomic():
+                scheduled_course.save()
+        except IntegrityError:
+            return JsonResponse(slot_taken)
         
         return JsonResponse({
             'success': True,
@@ -830,6 +890,7 @@ def reschedule_course(request, course_id):
 
 @staff_member_required
 @require_http_methods(["POST"])
+@transaction.atomic
 def dismiss_course(request, course_id):
     """Dismiss a scheduled course and revert all enrolled students back to pending status"""
     try:
@@ -842,15 +903,13 @@ def dismiss_course(request, course_id):
         course_name = f"{scheduled_course.skill_group} > {scheduled_course.skill_subgroup} > {scheduled_course.skill_name}"
         enrolled_count = enrolled_students.count()
         
-        # Revert all enrolled students back to pending status
-        for attendance in enrolled_students:
+        # Revert all enrolled students back to pending status (private lessons have no enrollment requests)
+        for attendance in ([] if scheduled_course.is_private else enrolled_students):
             # Find the corresponding enrollment request and revert it to pending
             try:
                 enrollment_request = CourseEnrollmentRequest.objects.get(
                     user=attendance.student,
-                    skill_group=scheduled_course.skill_group,
-                    skill_subgroup=scheduled_course.skill_subgroup,
-                    skill_name=scheduled_course.skill_name,
+                    course_id=scheduled_course.course_id,
                     status='approved'
                 )
                 
@@ -864,18 +923,14 @@ def dismiss_course(request, course_id):
                 # Delete the approved enrollment record
                 ApprovedCourseEnrollment.objects.filter(
                     user=attendance.student,
-                    skill_group=scheduled_course.skill_group,
-                    skill_subgroup=scheduled_course.skill_subgroup,
-                    skill_name=scheduled_course.skill_name
+                    course_id=scheduled_course.course_id
                 ).delete()
                 
             except CourseEnrollmentRequest.DoesNotExist:
                 # If no enrollment request found, create one in pending status
                 CourseEnrollmentRequest.objects.create(
                     user=attendance.student,
-                    skill_group=scheduled_course.skill_group,
-                    skill_subgroup=scheduled_course.skill_subgroup,
-                    skill_name=scheduled_course.skill_name,
+                    course_id=scheduled_course.course_id,
                     status='pending',
                     admin_notes=f'Course dismissed on {timezone.now().strftime("%Y-%m-%d at %H:%M")}. Created pending request.'
                 )
@@ -904,10 +959,10 @@ def course_detail(request, skill_group, skill_subgroup, skill_name):
     available_spots = ApprovedCourseEnrollment.get_available_spots(skill_group, skill_subgroup, skill_name)
     
     # Get upcoming scheduled courses for this skill
-    upcoming_courses = ScheduledCourse.objects.filter(
-        skill_group=skill_group,
-        skill_subgroup=skill_subgroup,
-        skill_name=skill_name,
+    upcoming_courses = ScheduledCourse.objects.for_course(
+        skill_group, skill_subgroup, skill_name
+    ).filter(
+        is_private=False,
         scheduled_date__gte=timezone.now().date()
     ).order_by('scheduled_date', 'scheduled_time')
     
@@ -921,8 +976,8 @@ def course_detail(request, skill_group, skill_subgroup, skill_name):
         courses_with_attendance.append({
             'course': course,
             'attendees': attendees,
-            'enrolled_count': attendees.count(),
-            'available_spots': course.max_students - attendees.count()
+            'enrolled_count': course.enrolled_count,
+            'available_spots': course.available_spots
         })
     
     course_name = f"{skill_group} > {skill_subgroup} > {skill_name}"
@@ -954,17 +1009,17 @@ def get_existing_sessions(request):
         return JsonResponse({'success': False, 'error': 'Missing required parameters'})
     
     # Get existing scheduled courses for this skill
-    scheduled_courses = ScheduledCourse.objects.filter(
-        skill_group=skill_group,
-        skill_subgroup=skill_subgroup,
-        skill_name=skill_name,
+    scheduled_courses = ScheduledCourse.objects.for_course(
+        skill_group, skill_subgroup, skill_name
+    ).filter(
+        is_private=False,
         scheduled_date__gte=timezone.now().date()  # Only future sessions
     ).order_by('scheduled_date', 'scheduled_time')
     
     sessions = []
     for course in scheduled_courses:
-        enrolled_count = CourseAttendance.objects.filter(scheduled_course=course).count()
-        available_spots = course.max_students - enrolled_count
+        enrolled_count = course.enrolled_count
+        available_spots = course.available_spots
         
         # Only include sessions that have available spots
         if available_spots > 0:
@@ -984,6 +1039,7 @@ def get_existing_sessions(request):
 
 @staff_member_required  
 @require_http_methods(["POST"])
+@transaction.atomic
 def add_to_existing_session(request):
     """Add all pending participants to an existing scheduled session"""
     try:
@@ -996,6 +1052,10 @@ def add_to_existing_session(request):
         if not all([session_id, skill_group, skill_subgroup, skill_name]):
             return JsonResponse({'success': False, 'error': 'Missing required parameters'})
         
+        course_id = SkillName.resolve_id(skill_group, skill_subgroup, skill_name)
+        if course_id is None:
+            return JsonResponse({'success': False, 'error': 'Course not found'})
+        
         # Get the scheduled course
         try:
             scheduled_course = ScheduledCourse.objects.get(id=session_id)
@@ -1004,17 +1064,14 @@ def add_to_existing_session(request):
         
         # Get pending enrollment requests for this course type
         pending_participants = CourseEnrollmentRequest.objects.filter(
-            skill_group=skill_group,
-            skill_subgroup=skill_subgroup,
-            skill_name=skill_name,
+            course_id=course_id,
             status='pending'
         )
         
         # Get already enrolled participants for this course type (any session)
         already_enrolled = CourseAttendance.objects.filter(
-            scheduled_course__skill_group=skill_group,
-            scheduled_course__skill_subgroup=skill_subgroup,
-            scheduled_course__skill_name=skill_name
+            scheduled_course__course_id=course_id,
+            scheduled_course__is_private=False
         ).values_list('student_id', flat=True)
         
         # Filter out already enrolled participants
@@ -1027,9 +1084,7 @@ def add_to_existing_session(request):
             })
         
         # Check if there's enough space in this specific session
-        current_enrolled_in_session = CourseAttendance.objects.filter(
-            scheduled_course=scheduled_course
-        ).count()
+        current_enrolled_in_session = scheduled_course.enrolled_count
         new_count = new_participants.count()
         
         if current_enrolled_in_session + new_count > scheduled_course.max_students:
@@ -1052,9 +1107,7 @@ def add_to_existing_session(request):
             # Create the approved enrollment record
             ApprovedCourseEnrollment.objects.create(
                 user=participant_request.user,
-                skill_group=skill_group,
-                skill_subgroup=skill_subgroup,
-                skill_name=skill_name,
+                course_id=course_id,
                 enrollment_request=participant_request
             )
             
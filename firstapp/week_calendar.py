@@ -0,0 +1,55 @@
+"""
+Per-week cache of the homepage calendar.
+
+index.html caches the rendered week grid as a template fragment, with one
+entry per ISO week, viewer variant and catalog version. The entries are
+written on a cache miss and dropped from the ScheduledCourse and
+CourseAttendance signals once the change commits, including the week a
+rescheduled course moved away from.
+
+The cache is shared by all workers (the database cache table, or Redis
+when REDIS_URL is set), so a change drops the entries every worker reads.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+FRAGMENT_NAME = 'week_calendar'
+VARIANTS = ('public', 'user', 'staff')
+
+
+def iso_week(day):
+    """Return the "YYYY-Www" ISO week of a date or ISO date string"""
+    if isinstance(day, str):
+        day = parse_date(day)
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def variant_for(user):
+    """Which rendering of the grid a user sees: links and buttons differ per variant"""
+    if not user.is_authenticated:
+        return 'public'
+    return 'staff' if user.is_staff else 'user'
+
+
+def cache_timeout():
+    return getattr(settings, 'WEEK_CALENDAR_CACHE_TIMEOUT', 300)
+
+
+def invalidate_weeks(days):
+    """Drop the cached grid for every week containing one of ``days`` once the transaction commits"""
+    from .catalog import get_catalog
+    weeks = {iso_week(day) for day in days if day}
+    if not weeks:
+        return
+    version = get_catalog().version
+    keys = [
+        make_template_fragment_key(FRAGMENT_NAME, [week, variant, version])
+        for week in weeks
+        for variant in VARIANTS
+    ]
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -58,6 +58,7 @@ if [[ $REPLY =~ ^[Yy]$ ]]; then
         
         # Recreate database structure
         python manage.py migrate
+        python manage.py createcachetable
         
         # Load skills if command exists
         if python manage.py help load_skills &>/dev/null; then
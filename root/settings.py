@@ -56,6 +56,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'firstapp.middleware.CatalogMiddleware',
 ]
 
 ROOT_URLCONF = 'root.urls'
@@ -72,6 +73,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'firstapp.context_processors.skills_context',
+                'firstapp.context_processors.week_calendar_context',
             ],
         },
     },
@@ -140,6 +142,36 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Skills catalog hot reload: seconds between checks of the catalog version per worker
+CATALOG_CHECK_INTERVAL = int(os.environ.get('CATALOG_CHECK_INTERVAL', 5))
+
+# The cache is shared between workers so that invalidating an entry reaches all of them:
+# Redis when REDIS_URL is set, otherwise a database table created by `manage.py createcachetable`
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'alt_cache',
+        }
+    }
+
+# Homepage week grid cache: seconds before an entry expires even without a schedule change
+WEEK_CALENDAR_CACHE_TIMEOUT = int(os.environ.get('WEEK_CALENDAR_CACHE_TIMEOUT', 300))
+
+# Private lesson booking window: weeks ahead (from this week's Monday), weekdays (0 = Monday)
+# and lesson start times
+PRIVATE_LESSON_WEEKS = int(os.environ.get('PRIVATE_LESSON_WEEKS', 4))
+PRIVATE_LESSON_WEEKDAYS = (0, 1, 2, 3, 4)
+PRIVATE_LESSON_START_TIMES = ('19:00', '20:00')
+PRIVATE_LESSON_DURATION_MINUTES = 60
+
 # Session configuration for OAuth flow
 SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 SESSION_COOKIE_AGE = 3600  # 1 hour